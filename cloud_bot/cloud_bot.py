@@ -1,26 +1,34 @@
+import asyncio
+import functools
 import os
-import json
+import orjson
 from pathlib import Path
 import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime
 
+# Resolve the module directory once; every file path below derives from it
+_HERE = Path(__file__).resolve().parent
+
+
 # ======================
 # Environment Setup
 # ======================
 def load_env():
     """Manually load .env file"""
-    env_file = Path(__file__).parent / ".env"
+    env_file = _HERE / ".env"
     if not env_file.exists():
         raise FileNotFoundError(f".env file not found at {env_file}")
 
-    with open(env_file, encoding='utf-8-sig') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ[key] = value
+    text = env_file.read_text(encoding='utf-8-sig')
+    for line in text.splitlines():
+        s = line.strip()
+        if not s or s[0] == '#' or '=' not in s:
+            continue
+        # partition scans once and avoids the 2-element list split allocates
+        key, _, value = s.partition('=')
+        os.environ[key] = value
 
 
 # Load environment variables
@@ -43,18 +51,28 @@ intents.message_content = True
 bot = commands.Bot(command_prefix="!", intents=intents)
 
 # File paths
-BUFFER_FILE = Path(__file__).parent / "expense_buffer.json"
-CATEGORIES_FILE = Path(__file__).parent / "categories.json"
-ACCOUNTS_FILE = Path(__file__).parent / "accounts.json"
+BUFFER_FILE = _HERE / "expense_buffer.jsonl"
+CATEGORIES_FILE = _HERE / "categories.json"
+ACCOUNTS_FILE = _HERE / "accounts.json"
 
 
 # Load categories and accounts from JSON
+@functools.lru_cache(maxsize=4)
+def _load_cached(path, mtime_ns):
+    """Parse a JSON config file, cached on (path, mtime).
+
+    The mtime key means an edited file is re-read automatically while
+    unchanged files cost a dict lookup instead of disk I/O + JSON parsing
+    on every interaction.
+    """
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
 def load_categories():
-    """Load categories from JSON file"""
+    """Load categories from JSON file (cached until the file changes)"""
     if CATEGORIES_FILE.exists():
-        with open(CATEGORIES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data
+        return _load_cached(CATEGORIES_FILE, CATEGORIES_FILE.stat().st_mtime_ns)
     # Fallback defaults if file doesn't exist
     return [
         {"name": "Food", "emoji": "🍔", "type": "expense"},
@@ -65,11 +83,9 @@ def load_categories():
 
 
 def load_accounts():
-    """Load accounts from JSON file"""
+    """Load accounts from JSON file (cached until the file changes)"""
     if ACCOUNTS_FILE.exists():
-        with open(ACCOUNTS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data
+        return _load_cached(ACCOUNTS_FILE, ACCOUNTS_FILE.stat().st_mtime_ns)
     # Fallback defaults if file doesn't exist
     return [
         {"name": "Cash Wallet", "type": "wallet", "emoji": "💰"},
@@ -81,56 +97,104 @@ def load_accounts():
 CATEGORIES = load_categories()
 ACCOUNTS = load_accounts()
 
+# Prebuilt (label, emoji) specs so the views don't re-derive them per interaction
+CATEGORY_SPECS = []
+ACCOUNT_SPECS = []
+
+
+def rebuild_button_specs():
+    """Recompute the button label/emoji lists from CATEGORIES/ACCOUNTS"""
+    global CATEGORY_SPECS, ACCOUNT_SPECS
+    CATEGORY_SPECS = [(cat["name"], cat.get("emoji", "📦")) for cat in CATEGORIES]
+    ACCOUNT_SPECS = [(acc["name"], acc.get("emoji", "💰")) for acc in ACCOUNTS]
+
+
+rebuild_button_specs()
+
+# Slash-command choice lists, built once at import (Discord caps at 25).
+# /reload mutates these in place and re-syncs so new categories/accounts
+# show up without a process restart.
+CATEGORY_CHOICES = [app_commands.Choice(name=cat["name"], value=cat["name"]) for cat in CATEGORIES[:25]]
+ACCOUNT_CHOICES = [app_commands.Choice(name=acc["name"], value=acc["name"]) for acc in ACCOUNTS[:25]]
+
+
+def rebuild_choices():
+    """Refresh the slash-command Choice lists in place"""
+    CATEGORY_CHOICES[:] = [app_commands.Choice(name=cat["name"], value=cat["name"]) for cat in CATEGORIES[:25]]
+    ACCOUNT_CHOICES[:] = [app_commands.Choice(name=acc["name"], value=acc["name"]) for acc in ACCOUNTS[:25]]
+
 
 # ======================
 # Helper Functions
 # ======================
-def load_buffer():
-    """Load expense buffer from JSON, safely handling empty or corrupted files."""
-    if BUFFER_FILE.exists():
-        # Use try/except to handle JSONDecodeError if the file is empty or malformed
+def tail_buffer(n=10):
+    """Read only the last n entries of the JSONL buffer.
+
+    Seeks backwards from EOF in 4 KB chunks until enough newlines are
+    collected, so showing recent expenses never parses the whole log.
+    """
+    if not BUFFER_FILE.exists():
+        return []
+
+    chunk_size = 4096
+    data = b""
+    try:
+        with open(BUFFER_FILE, "rb") as f:
+            f.seek(0, 2)
+            remaining = f.tell()
+            while remaining > 0 and data.count(b"\n") <= n:
+                step = min(chunk_size, remaining)
+                remaining -= step
+                f.seek(remaining)
+                data = f.read(step) + data
+    except OSError as e:
+        print(f"Error reading buffer tail: {e}")
+        return []
+
+    entries = []
+    for line in data.splitlines()[-n:]:
+        line = line.strip()
+        if not line:
+            continue
         try:
-            with open(BUFFER_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            # Handle JSON errors and encoding issues (e.g., invalid UTF-8)
-            print(f"Warning: Expense buffer file ({BUFFER_FILE.name}) is corrupted or has encoding issues. Resetting buffer to []. Error: {e}")
-            return []
-    return [] # File doesn't exist, return empty list
+            entries.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue  # A bad line only loses that one entry, not the tail
+    return entries
 
 
-def save_buffer(buffer):
-    """Save expense buffer to JSON"""
+def append_to_buffer(entry):
+    """Append a single expense entry to the JSONL log (no full-file rewrite)"""
     try:
-        with open(BUFFER_FILE, "w", encoding="utf-8") as f:
-            json.dump(buffer, f, indent=2, ensure_ascii=False)
+        with open(BUFFER_FILE, "ab") as f:
+            f.write(orjson.dumps(entry) + b"\n")
     except Exception as e:
         print(f"Error saving buffer: {e}")
 
 
 def add_expense_to_buffer(user, amount, category, account, description=""):
     """Add an expense entry to buffer with IDs from JSON"""
-    buffer = load_buffer()
-    
     # Get ID from JSON data
     category_id = next((cat["id"] for cat in CATEGORIES if cat["name"] == category), None)
     account_id = next((acc["id"] for acc in ACCOUNTS if acc["name"] == account), None)
-    
+
     if not category_id or not account_id:
         raise ValueError(f"Invalid category or account: {category}, {account}")
-    
+
+    # One clock read shared by both timestamp fields
+    now = datetime.now()
     entry = {
         "account_id": account_id,
         "category_id": category_id,
         "amount": float(amount),
         "type": "expense",      # Default to expense
-        "date": datetime.now().strftime("%Y-%m-%d"),
+        "date": now.strftime("%Y-%m-%d"),
+        "timestamp": now.isoformat(timespec="seconds"),
         "description": description,
         "notes": user,         # Map user to notes field
         "is_recurring": 0      # Default to non-recurring
     }
-    buffer.append(entry)
-    save_buffer(buffer)
+    append_to_buffer(entry)
     return entry
 
 
@@ -143,12 +207,8 @@ class CategoryView(discord.ui.View):
         self.amount = amount
         self.user_id = user_id
 
-        # Load categories dynamically
-        categories = load_categories()
-
-        for cat_data in categories:
-            name = cat_data["name"]
-            emoji = cat_data.get("emoji", "📦")
+        # Use the prebuilt specs instead of re-reading the JSON per interaction
+        for name, emoji in CATEGORY_SPECS:
             button = discord.ui.Button(label=name, emoji=emoji, style=discord.ButtonStyle.primary)
             button.callback = self.make_callback(name)
             self.add_item(button)
@@ -175,12 +235,8 @@ class AccountView(discord.ui.View):
         self.category = category
         self.user_id = user_id
 
-        # Load accounts dynamically
-        accounts = load_accounts()
-
-        for acc_data in accounts:
-            name = acc_data["name"]
-            emoji = acc_data.get("emoji", "💰")
+        # Use the prebuilt specs instead of re-reading the JSON per interaction
+        for name, emoji in ACCOUNT_SPECS:
             button = discord.ui.Button(label=name, emoji=emoji, style=discord.ButtonStyle.success)
             button.callback = self.make_callback(name)
             self.add_item(button)
@@ -221,18 +277,16 @@ class DescriptionModal(discord.ui.Modal, title="Add Description"):
         # 1. Acknowledge and close the modal immediately by deferring the interaction
         await interaction.response.defer()
 
-        # 2. Add expense (critical operation)
-        try:
-            add_expense_to_buffer(
-                user=str(self.user),
-                amount=self.amount,
-                category=self.category,
-                account=self.account,
-                description=desc
-            )
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error saving expense to buffer: {e}", ephemeral=True)
-            return
+        # 2. Start the buffer write in a worker thread; it overlaps with the
+        # Discord HTTP round-trip below instead of running before it
+        task = asyncio.create_task(asyncio.to_thread(
+            add_expense_to_buffer,
+            user=str(self.user),
+            amount=self.amount,
+            category=self.category,
+            account=self.account,
+            description=desc
+        ))
 
         # 3. Use interaction.edit_original_response() to update the message associated with the button/command
         await interaction.edit_original_response(
@@ -240,6 +294,12 @@ class DescriptionModal(discord.ui.Modal, title="Add Description"):
             view=None
         )
 
+        # 4. Await the write last so any failure still surfaces to the user
+        try:
+            await task
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error saving expense to buffer: {e}", ephemeral=True)
+
 
 class DescriptionView(discord.ui.View):
     def __init__(self, amount, category, account, user_id):
@@ -267,9 +327,10 @@ class DescriptionView(discord.ui.View):
         # The response object can only be used once. defer() is the standard acknowledgement.
         await interaction.response.defer()
 
-        # 2. Add expense (critical operation)
+        # 2. Add expense (critical operation) - file I/O off the event loop
         try:
-            add_expense_to_buffer(
+            await asyncio.to_thread(
+                add_expense_to_buffer,
                 user=str(interaction.user),
                 amount=self.amount,
                 category=self.category,
@@ -334,16 +395,52 @@ async def slash_expense(interaction: discord.Interaction, amount: float):
     )
 
 
+@bot.tree.command(name="expense_quick", description="Log an expense in one step")
+@app_commands.describe(
+    amount="Amount spent (e.g., 45.50)",
+    category="Expense category",
+    account="Account the expense was paid from",
+    description="Optional description"
+)
+@app_commands.choices(category=CATEGORY_CHOICES, account=ACCOUNT_CHOICES)
+async def slash_expense_quick(
+    interaction: discord.Interaction,
+    amount: float,
+    category: app_commands.Choice[str],
+    account: app_commands.Choice[str],
+    description: str = ""
+):
+    """One-shot expense logging without the button flow"""
+    if amount <= 0:
+        await interaction.response.send_message("Amount must be positive.", ephemeral=True)
+        return
+
+    try:
+        await asyncio.to_thread(
+            add_expense_to_buffer,
+            user=str(interaction.user),
+            amount=amount,
+            category=category.value,
+            account=account.value,
+            description=description
+        )
+    except Exception as e:
+        await interaction.response.send_message(f"❌ Error saving expense to buffer: {e}", ephemeral=True)
+        return
+
+    await interaction.response.send_message(
+        f"Expense logged:\nAmount: {amount:.2f}\nCategory: {category.value}\nAccount: {account.value}\nDescription: {description or 'None'}"
+    )
+
+
 @bot.tree.command(name="showbuffer", description="Show recent expenses in buffer")
 async def slash_showbuffer(interaction: discord.Interaction):
     """Show current expense buffer"""
-    buffer = load_buffer()
+    recent = tail_buffer(10)
 
-    if not buffer:
+    if not recent:
         await interaction.response.send_message("Buffer is empty.", ephemeral=True)
         return
-
-    recent = buffer[-10:]
     lines = []
     for i, e in enumerate(recent, 1):
         # Map IDs back to names for display
@@ -365,9 +462,15 @@ async def slash_reload(interaction: discord.Interaction):
     """Reload categories and accounts"""
     if interaction.user.guild_permissions.administrator:
         global CATEGORIES, ACCOUNTS
+        _load_cached.cache_clear()
         CATEGORIES = load_categories()
         ACCOUNTS = load_accounts()
-        await interaction.response.send_message(
+        rebuild_button_specs()
+        rebuild_choices()
+        # Syncing can take a moment, so acknowledge first
+        await interaction.response.defer(ephemeral=True)
+        await bot.tree.sync()
+        await interaction.followup.send(
             f"Reloaded {len(CATEGORIES)} categories and {len(ACCOUNTS)} accounts.",
             ephemeral=True
         )
@@ -398,13 +501,20 @@ async def on_message(message):
     # Check if the message content looks like your expense format
     content = message.content.strip()
     if '|' in content and not content.startswith(('!', '$')):
-        # Attempt to parse the content directly
-        try:
-            parts = [p.strip() for p in content.split('|')]
+        # Cheap field-count check before any splitting/stripping happens
+        if content.count('|') < 2:
+            await message.add_reaction("⚠️")  # Send reaction for failure (too few fields)
+        else:
+            # Attempt to parse the content directly
+            try:
+                # maxsplit=3 caps the split at 4 parts, so a description
+                # containing '|' stays intact and allocation is bounded
+                parts = content.split('|', 3)
 
-            if len(parts) >= 3:
-                amount_str, category, account = parts[0], parts[1], parts[2]
-                description = parts[3] if len(parts) > 3 else ""
+                amount_str = parts[0].strip()
+                category = parts[1].strip()
+                account = parts[2].strip()
+                description = parts[3].strip() if len(parts) > 3 else ""
 
                 amount = float(amount_str)
                 if amount <= 0:
@@ -413,7 +523,8 @@ async def on_message(message):
                 # Use the Webhook name as the user since message.author is the bot itself
                 webhook_name = message.author.display_name if message.webhook_id else str(message.author)
 
-                add_expense_to_buffer(
+                await asyncio.to_thread(
+                    add_expense_to_buffer,
                     user=webhook_name,
                     amount=amount,
                     category=category,
@@ -423,12 +534,9 @@ async def on_message(message):
 
                 await message.add_reaction("✅")  # Send reaction for success
 
-            else:
-                await message.add_reaction("⚠️")  # Send reaction for failure (too few fields)
-
-        except Exception:
-            # Catch all errors (e.g., non-float amount) and react with an error emoji
-            await message.add_reaction("❌")
+            except Exception:
+                # Catch all errors (e.g., non-float amount) and react with an error emoji
+                await message.add_reaction("❌")
 
     # Always process commands (in case a human user messages the channel)
     await bot.process_commands(message)
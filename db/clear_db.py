@@ -7,25 +7,24 @@ def clear_database():
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
 
-    # Clear all tables
-    cur.execute("DELETE FROM accounts")
-    cur.execute("DELETE FROM categories")
-    cur.execute("DELETE FROM transactions")
-    cur.execute("DELETE FROM transfers")
-    cur.execute("DELETE FROM bills")
-    cur.execute("DELETE FROM reminder_log")
-    cur.execute("DELETE FROM subscriptions")
+    # Clear all tables and reset autoincrement counters in one script /
+    # one transaction instead of 14 separate execute round-trips
+    cur.executescript("""
+        BEGIN;
+        DELETE FROM accounts;
+        DELETE FROM categories;
+        DELETE FROM transactions;
+        DELETE FROM transfers;
+        DELETE FROM bills;
+        DELETE FROM reminder_log;
+        DELETE FROM subscriptions;
+        DELETE FROM sqlite_sequence WHERE name IN (
+            'accounts', 'categories', 'transactions', 'transfers',
+            'bills', 'reminder_log', 'subscriptions'
+        );
+        COMMIT;
+    """)
 
-    # Reset autoincrement counters
-    cur.execute("DELETE FROM sqlite_sequence WHERE name='accounts'")
-    cur.execute("DELETE FROM sqlite_sequence WHERE name='categories'")
-    cur.execute("DELETE FROM sqlite_sequence WHERE name='transactions'")
-    cur.execute("DELETE FROM sqlite_sequence WHERE name='transfers'")
-    cur.execute("DELETE FROM sqlite_sequence WHERE name='bills'")
-    cur.execute("DELETE FROM sqlite_sequence WHERE name='reminder_log'")
-    cur.execute("DELETE FROM sqlite_sequence WHERE name='subscriptions'")
-
-    conn.commit()
     conn.close()
     print("✅ Database cleared successfully.")
 
@@ -9,8 +9,9 @@ def init_db():
     # Make sure db folder exists
     DB_PATH.parent.mkdir(exist_ok=True)
 
-    # Read schema.sql
-    schema_sql = SCHEMA_PATH.read_text(encoding="utf-8")
+    # Read schema.sql as raw bytes and decode once; skips the incremental
+    # text-mode decoding layer for what is an ASCII-only file
+    schema_sql = SCHEMA_PATH.read_bytes().decode("utf-8")
 
     # Connect to database (creates file if it doesn't exist)
     conn = sqlite3.connect(DB_PATH)
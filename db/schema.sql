@@ -58,12 +58,26 @@ CREATE TABLE reminder_log (
   FOREIGN KEY (bill_id) REFERENCES bills(id)
 );
 
+-- Indexes for the hot lookups (kept in sync with pc_bot/db_manager.py,
+-- which also creates them on existing databases)
+CREATE INDEX IF NOT EXISTS idx_tx_account ON transactions(account_id);
+CREATE INDEX IF NOT EXISTS idx_tx_date ON transactions(date DESC);
+CREATE INDEX IF NOT EXISTS idx_tx_date_id ON transactions(date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tx_account_date ON transactions(account_id, date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_bills_account_due ON bills(account_id, due_date);
+CREATE INDEX IF NOT EXISTS idx_bills_due ON bills(due_date);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_name ON accounts(name);
+CREATE INDEX IF NOT EXISTS idx_tx_category ON transactions(category_id);
+CREATE INDEX IF NOT EXISTS idx_transfers_from ON transfers(from_transaction_id);
+CREATE INDEX IF NOT EXISTS idx_transfers_to ON transfers(to_transaction_id);
+
 -- Subscriptions: recurring charges with variable amounts
 CREATE TABLE subscriptions (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   name TEXT NOT NULL,
   frequency TEXT NOT NULL, -- 'monthly', 'yearly', etc.
   next_due_date TEXT NOT NULL,
+  amount REAL,
   account_id INTEGER NOT NULL,
   category_id INTEGER,
   last_posted_date TEXT,
@@ -8,6 +8,10 @@ def seed_db():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    # Seeding-only tuning: everything in one transaction, no per-statement
+    # fsync. Safe here because a failed seed can simply be re-run.
+    cursor.executescript("PRAGMA synchronous=OFF; PRAGMA journal_mode=MEMORY; BEGIN;")
+
     # --- Accounts ---
     accounts = [
         ("Cash Wallet", "wallet", 0, 1),
@@ -79,6 +83,7 @@ def seed_db():
         subscriptions,
     )
 
+    conn.commit()
     conn.close()
     print("Database seeded successfully!")
 
@@ -1,53 +1,440 @@
 """
 db_manager.py - Centralized database operations for the Income Expense Tracker
 """
+import atexit
+import itertools
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Module logger; handler/level configuration belongs to the application
+# entry point, not to importers of this library module
 logger = logging.getLogger(__name__)
 
 # Paths
 DB_PATH = Path(__file__).resolve().parent.parent / "db" / "expenses.db"
-DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # Ensure db directory exists
 EXPORT_DIR = Path(__file__).resolve().parent.parent / "cloud_bot"
 
+# Deferred until the first connect/export so importing this module
+# stays free of filesystem syscalls (tests and tooling import it
+# without a DB); after that, one mkdir total instead of one per call
+_dir_ready = False
+_export_dir_ready = False
+
 # ======================
 # Database Connection
 # ======================
 
+# One connection per thread, reused across calls. Opening a SQLite
+# connection pays file-open syscalls, PRAGMA replay, and a cold page
+# cache on every call; reusing it keeps hot B-tree pages in memory.
+_local = threading.local()
+_open_connections: List[sqlite3.Connection] = []
+_open_lock = threading.Lock()
+
+# Indexes backing the hot lookups (transaction existence checks per
+# account, date-ordered listings, upcoming bills). Applied on connect
+# with IF NOT EXISTS so existing databases pick them up; kept in sync
+# with db/schema.sql for fresh ones.
+_SCHEMA_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_tx_account ON transactions(account_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tx_date ON transactions(date DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_tx_date_id ON transactions(date DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_tx_account_date ON transactions(account_id, date DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_bills_account_due ON bills(account_id, due_date)",
+    "CREATE INDEX IF NOT EXISTS idx_bills_due ON bills(due_date)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_name ON accounts(name)",
+    "CREATE INDEX IF NOT EXISTS idx_tx_category ON transactions(category_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transfers_from ON transfers(from_transaction_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transfers_to ON transfers(to_transaction_id)",
+)
+
+# Columns added after the original schema shipped, applied on connect
+# so existing databases pick them up. Each statement runs on its own
+# because ALTER raises "duplicate column" once the column exists. The
+# backfill moves legacy "AMOUNT:<x>" markers out of last_posted_date,
+# where earlier versions stashed the subscription amount.
+_SCHEMA_MIGRATIONS = (
+    "ALTER TABLE subscriptions ADD COLUMN amount REAL",
+    "UPDATE subscriptions"
+    " SET amount = CAST(substr(last_posted_date, 8) AS REAL), last_posted_date = NULL"
+    " WHERE last_posted_date LIKE 'AMOUNT:%'",
+)
+
+def _ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Create the supporting indexes and apply column migrations.
+
+    Every statement runs under its own guard: one failure (a fresh file
+    before init_db ran, or existing data that violates an index) must
+    not skip the remaining statements or break get_connection itself.
+    """
+    for stmt in _SCHEMA_MIGRATIONS:
+        try:
+            conn.execute(stmt)
+        except sqlite3.DatabaseError as e:
+            logger.debug("Skipping migration: %s", e)
+    for stmt in _SCHEMA_INDEXES:
+        try:
+            conn.execute(stmt)
+        except sqlite3.IntegrityError as e:
+            # Existing rows violate the index — e.g. duplicate account
+            # names from before idx_accounts_name enforced uniqueness.
+            # Skip it loudly and leave the database usable; the dupes
+            # need a manual cleanup before the index can land.
+            logger.error("Cannot create index (%s); statement skipped: %s", e, stmt)
+        except sqlite3.OperationalError as e:
+            # Schema not initialized yet (e.g. fresh file before init_db ran)
+            logger.debug("Skipping index creation: %s", e)
+        except sqlite3.DatabaseError as e:
+            logger.error("Index creation failed (%s): %s", e, stmt)
+    conn.commit()
+
 def get_connection() -> sqlite3.Connection:
-    """Get a database connection.
-    
+    """Get the calling thread's cached database connection.
+
+    The connection is opened lazily on first use and reused for all
+    subsequent calls from the same thread.
+
     Returns:
         sqlite3.Connection: Database connection object
     """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    global _dir_ready
+    if not _dir_ready:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _dir_ready = True
+
     try:
-        conn = sqlite3.connect(DB_PATH)
+        # check_same_thread=False so the atexit hook can close it.
+        # cached_statements keeps the prepared plans of the hot SELECT /
+        # INSERT literals alive, so repeat calls skip SQLite's parse and
+        # planning step entirely.
+        # isolation_level=None disables the implicit-transaction wrapper:
+        # statements run in autocommit and write scopes take their lock
+        # explicitly with BEGIN IMMEDIATE (see db_scope)
+        conn = sqlite3.connect(
+            DB_PATH, check_same_thread=False, cached_statements=256, isolation_level=None
+        )
+        # Rows come back as sqlite3.Row: numeric indexing still works and
+        # dict(row) converts in C instead of hand-built dict literals
+        conn.row_factory = sqlite3.Row
         # Enable foreign key support
         conn.execute("PRAGMA foreign_keys = ON")
+        # Tuning: WAL lets readers run alongside a writer and drops one
+        # fsync per commit vs the rollback journal (NORMAL is durable
+        # enough under WAL). The rest keep temp structures and ~64 MB of
+        # hot pages in memory. journal_mode persists in the database file
+        # and leaves -wal/-shm sidecar files next to it; the other
+        # PRAGMAs are per-connection, so they run once per cached
+        # connection here.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA busy_timeout=5000")
+        _ensure_indexes(conn)
+        _local.conn = conn
+        with _open_lock:
+            _open_connections.append(conn)
         return conn
     except sqlite3.Error as e:
-        logger.error(f"Error connecting to database: {e}")
+        logger.error("Error connecting to database: %s", e)
         raise
 
 def close_connection(conn: sqlite3.Connection) -> None:
-    """Close the database connection.
-    
+    """No-op kept for API compatibility.
+
+    Connections are cached per thread and closed once at interpreter
+    shutdown, so callers no longer close them after every operation.
+
+    Args:
+        conn: Database connection (ignored)
+    """
+    pass
+
+@atexit.register
+def _close_all_connections() -> None:
+    """Close every cached connection at interpreter shutdown."""
+    with _open_lock:
+        for conn in _open_connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _open_connections.clear()
+
+@contextmanager
+def db_scope(write: bool = False):
+    """Commit-on-success / rollback-on-error scope over the cached connection.
+
+    Replaces the per-function try/except/finally scaffolding: the body
+    runs against the thread's cached connection, a clean exit commits,
+    and any sqlite3.Error rolls back before propagating to the caller's
+    error handling.
+
+    Write scopes open with BEGIN IMMEDIATE so the write lock is taken
+    up front instead of being upgraded lazily on the first write, which
+    under WAL can fail with SQLITE_BUSY when another writer got there
+    first.
+
+    Args:
+        write: Open an immediate write transaction for the scope.
+    """
+    conn = get_connection()
+    if _uow_active():
+        # An enclosing unit_of_work owns the transaction; run the body
+        # inside it and leave commit/rollback to the outer scope
+        yield conn
+        return
+    try:
+        if write:
+            conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+    except BaseException:
+        # Roll back on anything, not just sqlite3.Error: a ValueError
+        # raised inside a write scope (e.g. float() on bad input) must
+        # not leave the BEGIN IMMEDIATE open on the cached connection
+        conn.rollback()
+        raise
+
+def _uow_active() -> bool:
+    """True when the calling thread is inside a unit_of_work scope."""
+    return getattr(_local, "in_uow", False)
+
+def _maybe_commit(conn: sqlite3.Connection) -> None:
+    """Commit unless an enclosing unit_of_work will commit later."""
+    if not _uow_active():
+        conn.commit()
+
+def _maybe_rollback(conn: sqlite3.Connection) -> None:
+    """Roll back unless an enclosing unit_of_work owns the transaction."""
+    if not _uow_active():
+        conn.rollback()
+
+@contextmanager
+def unit_of_work():
+    """Batch many mutating calls into a single transaction.
+
+    The per-call APIs commit after every write, so scripted callers
+    (CSV importers, recurring-bill generators) pay one journal flush
+    per row. Inside this scope the mutators skip their own commit and
+    the whole batch lands in one BEGIN IMMEDIATE/COMMIT:
+
+        with db_manager.unit_of_work():
+            for row in rows:
+                db_manager.add_transaction(**row)
+
+    A clean exit commits everything at once; any exception rolls the
+    whole batch back. Nested scopes join the outermost transaction.
+    """
+    conn = get_connection()
+    if _uow_active():
+        yield conn
+        return
+    _local.in_uow = True
+    with _cache_lock:
+        dirty_before = set(_dirty_exports)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        # Readers called inside the scope repopulate the module caches
+        # from the still-open transaction; after a rollback those
+        # entries describe rows that never landed, so drop them all
+        _invalidate_accounts_cache()
+        _invalidate_categories_cache()
+        _invalidate_subscriptions_cache()
+        # Likewise, export marks added by the failed scope would only
+        # rewrite an unchanged snapshot at exit
+        with _cache_lock:
+            _dirty_exports.intersection_update(dirty_before)
+        raise
+    finally:
+        _local.in_uow = False
+
+# SQLite >= 3.35 can hand back the new row id from the INSERT itself
+# via RETURNING, saving the separate lastrowid C-API call per insert.
+# executemany() does not support RETURNING, so bulk paths keep their
+# last_insert_rowid() recovery.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_RETURNING_ID = " RETURNING id" if _HAS_RETURNING else ""
+
+def _insert_row(conn: sqlite3.Connection, sql: str, params: Tuple) -> int:
+    """Run a single-row INSERT and return the new row id."""
+    cursor = conn.execute(sql + _RETURNING_ID, params)
+    if _HAS_RETURNING:
+        return cursor.fetchone()[0]
+    return cursor.lastrowid
+
+# "Called often, changes rarely" caches for the list helpers. Mutating
+# functions reset them to None; readers repopulate on the next call.
+_cache_lock = threading.Lock()
+_accounts_cache: Optional[List[Dict[str, Any]]] = None
+_categories_cache: Optional[List[Dict[str, Any]]] = None
+
+# Read-through caches for single-category lookups: categories are hot,
+# effectively immutable data (every transaction render resolves one),
+# so repeat hits skip SQLite entirely
+_category_cache: Dict[int, Dict[str, Any]] = {}
+_category_name_cache: Dict[str, Dict[str, Any]] = {}
+
+def _invalidate_accounts_cache() -> None:
+    global _accounts_cache
+    with _cache_lock:
+        _accounts_cache = None
+
+def _invalidate_categories_cache() -> None:
+    global _categories_cache
+    with _cache_lock:
+        _categories_cache = None
+        _category_cache.clear()
+        _category_name_cache.clear()
+
+# Read-through caches for subscriptions: bot menus fetch the same
+# records repeatedly (display -> edit -> confirm), so repeat hits skip
+# SQLite. The list cache is keyed by the active_only flag.
+_subscription_cache: Dict[int, Dict[str, Any]] = {}
+_subscriptions_list_cache: Dict[bool, List[Dict[str, Any]]] = {}
+
+def _invalidate_subscriptions_cache() -> None:
+    with _cache_lock:
+        _subscription_cache.clear()
+        _subscriptions_list_cache.clear()
+
+# Tables whose JSON snapshot is stale. Mutators mark their table dirty
+# instead of rewriting the snapshot per change, so a loop of N writes
+# does one export at flush time instead of N full-file rewrites.
+_dirty_exports: set = set()
+
+def _mark_export_dirty(data_type: str) -> None:
+    with _cache_lock:
+        _dirty_exports.add(data_type)
+
+@atexit.register
+def flush_exports() -> None:
+    """Export every table marked dirty since the last flush.
+
+    Registered with atexit so pending snapshots land on exit; callers
+    doing a burst of writes can also call it directly to publish the
+    JSON snapshots immediately.
+    """
+    with _cache_lock:
+        pending = sorted(_dirty_exports)
+        _dirty_exports.clear()
+    for key in pending:
+        try:
+            export_to_json(key)
+        except (sqlite3.Error, OSError) as e:
+            logger.error("Deferred export of %s failed: %s", key, e)
+
+# SQLite caps compound VALUES lists at 500 rows per statement
+_BULK_CHUNK = 500
+
+# Rows fetched per batch by the iter_* streaming helpers
+_ITER_BATCH = 1000
+
+def bulk_insert(cursor: sqlite3.Cursor, table: str, cols: Tuple[str, ...],
+                rows: List[Tuple], chunk: int = _BULK_CHUNK) -> int:
+    """Insert rows using multi-row ``VALUES (...),(...)`` statements.
+
+    executemany still dispatches one VDBE execution per row; a single
+    INSERT with a compound VALUES list is one statement per chunk of up
+    to 500 rows. Runs on the caller's cursor so it joins the caller's
+    transaction — the caller commits (or rolls back).
+
     Args:
-        conn: Database connection to close
+        cursor: Cursor from the caller's connection.
+        table: Target table name (trusted, not user input).
+        cols: Column names to insert into.
+        rows: Sequence of value tuples, one per row.
+        chunk: Maximum rows per statement.
+
+    Returns:
+        int: Number of rows inserted.
     """
-    if conn:
-        conn.close()
+    placeholder = "(%s)" % ", ".join("?" * len(cols))
+    prefix = "INSERT INTO %s (%s) VALUES " % (table, ", ".join(cols))
+    inserted = 0
+    for start in range(0, len(rows), chunk):
+        batch = rows[start:start + chunk]
+        sql = prefix + ", ".join([placeholder] * len(batch))
+        cursor.execute(sql, list(itertools.chain.from_iterable(batch)))
+        inserted += cursor.rowcount
+    return inserted
 
 # ======================
 # Account Management
 # ======================
 
+# Updatable fields mapped to their actual column names ('balance' is
+# stored as virtual_balance). A dict lookup per field replaces the
+# per-field list-membership scan and ternary in update_account.
+_ACCOUNT_UPDATABLE = {
+    'name': 'name',
+    'type': 'type',
+    'balance': 'virtual_balance',
+    'active': 'active',
+}
+
+# Validation sets as module-level frozensets: the hot add/update paths
+# test membership against these instead of allocating a set per call
+_CATEGORY_TYPES = frozenset({"income", "expense"})
+_TXN_TYPES = frozenset({"income", "expense", "transfer"})
+
+# Maps the common casings of each type straight to canonical form so
+# hot paths pay one dict hit instead of two string allocations; odd
+# inputs ("  Income ") fall back to strip().lower()
+_TYPE_NORMALIZER: Dict[str, str] = {
+    casing: canonical
+    for canonical in _TXN_TYPES
+    for casing in (canonical, canonical.capitalize(), canonical.upper())
+}
+
+def _normalize_type(raw: str) -> str:
+    """Canonicalize a type value to lowercase stripped form."""
+    return _TYPE_NORMALIZER.get(raw) or raw.strip().lower()
+_CATEGORY_UPDATE_FIELDS = frozenset({"name", "type", "emoji"})
+_BILL_UPDATE_FIELDS = frozenset({"name", "amount", "due_date", "repeat_freq", "account_id"})
+_SUBSCRIPTION_UPDATE_FIELDS = frozenset({
+    "name", "frequency", "next_due_date", "account_id",
+    "category_id", "amount", "last_posted_date", "active",
+})
+
+# SQL text per updated-field set for update_subscription, mirroring
+# _UPDATE_SQL_CACHE for accounts
+_SUBSCRIPTION_UPDATE_SQL_CACHE: Dict[frozenset, str] = {}
+
+# Hot SQL literals lifted to module scope: one Python string object per
+# statement means cursor.execute always sees the same object and
+# SQLite's prepared-statement cache (cached_statements=256) always hits
+_SQL_INSERT_ACCOUNT = "INSERT INTO accounts (name, type, virtual_balance, active) VALUES (?, ?, 0, 1)"
+_SQL_SELECT_ACCOUNT_BY_ID = (
+    "SELECT id, name, type, virtual_balance AS balance, active FROM accounts WHERE id = ?"
+)
+_SQL_SELECT_ACCOUNT_BY_NAME = (
+    "SELECT id, name, type, virtual_balance AS balance, active FROM accounts WHERE name = ?"
+)
+_SQL_LIST_ACCOUNTS = (
+    "SELECT id, name, type, virtual_balance AS balance, active FROM accounts ORDER BY name"
+)
+
+# With 4 updatable columns there are only 15 possible UPDATE statements;
+# cache them by field set so repeat updates skip the string building and
+# reuse the connection's prepared-statement cache for the same literal
+_UPDATE_SQL_CACHE: Dict[frozenset, str] = {}
+
 def add_account(name: str, account_type: str, emoji: str = None) -> int:
     """Add a new account to the database.
 
@@ -62,31 +449,53 @@ def add_account(name: str, account_type: str, emoji: str = None) -> int:
     Raises:
         sqlite3.IntegrityError: If account name already exists
     """
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with db_scope(write=True) as conn:
+            # Schema only has: id, name, type, virtual_balance, active
+            # We'll use virtual_balance as the balance field
+            account_id = _insert_row(conn, _SQL_INSERT_ACCOUNT, (name, account_type))
+        _invalidate_accounts_cache()
+        _mark_export_dirty("accounts")
+        logger.info("Added account '%s' with ID %s", name, account_id)
+        return account_id
+    except sqlite3.Error as e:
+        logger.error("Error adding account '%s': %s", name, e)
+        raise
 
-        # Schema only has: id, name, type, virtual_balance, active
-        # We'll use virtual_balance as the balance field
-        cursor.execute(
-            "INSERT INTO accounts (name, type, virtual_balance, active) VALUES (?, ?, 0, 1)",
-            (name, account_type)
-        )
-        conn.commit()
+def add_accounts_bulk(rows: List[Tuple[str, str]]) -> int:
+    """Add many accounts in a single transaction.
 
-        account_id = cursor.lastrowid
-        logger.info(f"Added account '{name}' with ID {account_id}")
-        return account_id
+    Inserting one-by-one through add_account costs a commit (fsync) per
+    row and would re-export the JSON snapshot each time; this batches
+    the inserts and exports once at the end.
+
+    Args:
+        rows: List of (name, account_type) tuples.
+
+    Returns:
+        int: Number of accounts inserted.
+
+    Raises:
+        sqlite3.IntegrityError: If any account name already exists.
+    """
+    if not rows:
+        return 0
 
+    try:
+        with db_scope(write=True) as conn:
+            inserted = bulk_insert(
+                conn.cursor(),
+                "accounts",
+                ("name", "type", "virtual_balance", "active"),
+                [(name, account_type, 0, 1) for name, account_type in rows],
+            )
+        _invalidate_accounts_cache()
+        _mark_export_dirty("accounts")
+        logger.info("Added %s account(s) in bulk", inserted)
+        return inserted
     except sqlite3.Error as e:
-        logger.error(f"Error adding account '{name}': {e}")
-        if conn:
-            conn.rollback()
+        logger.error("Error bulk-adding accounts: %s", e)
         raise
-    finally:
-        if conn:
-            close_connection(conn)
 
 def get_account(account_id: int) -> Optional[Dict[str, Any]]:
     """Get an account by ID.
@@ -97,34 +506,14 @@ def get_account(account_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Dict containing account information or None if not found
     """
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Schema: id, name, type, virtual_balance, active
-        cursor.execute(
-            "SELECT id, name, type, virtual_balance, active FROM accounts WHERE id = ?",
-            (account_id,)
-        )
-
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row[0],
-                'name': row[1],
-                'type': row[2],
-                'balance': row[3],  # virtual_balance from schema
-                'active': row[4]
-            }
-        return None
-
+        with db_scope() as conn:
+            # Schema: id, name, type, virtual_balance, active
+            row = conn.execute(_SQL_SELECT_ACCOUNT_BY_ID, (account_id,)).fetchone()
+        return dict(row) if row else None
     except sqlite3.Error as e:
-        logger.error(f"Error getting account with ID {account_id}: {e}")
+        logger.error("Error getting account with ID %s: %s", account_id, e)
         return None
-    finally:
-        if conn:
-            close_connection(conn)
 
 def get_account_by_name(name: str) -> Optional[Dict[str, Any]]:
     """Get an account by name.
@@ -135,34 +524,14 @@ def get_account_by_name(name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dict containing account information or None if not found
     """
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Schema: id, name, type, virtual_balance, active
-        cursor.execute(
-            "SELECT id, name, type, virtual_balance, active FROM accounts WHERE name = ?",
-            (name,)
-        )
-
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row[0],
-                'name': row[1],
-                'type': row[2],
-                'balance': row[3],  # virtual_balance from schema
-                'active': row[4]
-            }
-        return None
-
+        with db_scope() as conn:
+            # Schema: id, name, type, virtual_balance, active
+            row = conn.execute(_SQL_SELECT_ACCOUNT_BY_NAME, (name,)).fetchone()
+        return dict(row) if row else None
     except sqlite3.Error as e:
-        logger.error(f"Error getting account '{name}': {e}")
+        logger.error("Error getting account '%s': %s", name, e)
         return None
-    finally:
-        if conn:
-            close_connection(conn)
 
 def update_account(account_id: int, **updates) -> bool:
     """Update an account's information.
@@ -178,48 +547,41 @@ def update_account(account_id: int, **updates) -> bool:
         logger.warning("No updates provided for account update")
         return False
 
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Build dynamic update query - schema only allows: name, type, virtual_balance, active
-        set_clauses = []
-        values = []
-
-        for field, value in updates.items():
-            if field in ['name', 'type', 'balance', 'active']:
-                set_clauses.append(f"{field} = ?" if field != 'balance' else "virtual_balance = ?")
-                values.append(value)
-            else:
-                logger.warning(f"Invalid field '{field}' for account update")
-
-        if not set_clauses:
-            logger.warning("No valid fields to update")
-            return False
+    # Schema only allows: name, type, virtual_balance, active.
+    # Fields are sorted so the same field set always yields the same
+    # SQL string and value order, making the statement cacheable.
+    valid_fields = sorted(f for f in updates if f in _ACCOUNT_UPDATABLE)
+    for field in updates:
+        if field not in _ACCOUNT_UPDATABLE:
+            logger.warning("Invalid field '%s' for account update", field)
 
-        values.append(account_id)
+    if not valid_fields:
+        logger.warning("No valid fields to update")
+        return False
 
-        query = f"UPDATE accounts SET {', '.join(set_clauses)} WHERE id = ?"
+    key = frozenset(valid_fields)
+    query = _UPDATE_SQL_CACHE.get(key)
+    if query is None:
+        set_clause = ", ".join(f"{_ACCOUNT_UPDATABLE[f]} = ?" for f in valid_fields)
+        query = f"UPDATE accounts SET {set_clause} WHERE id = ?"
+        _UPDATE_SQL_CACHE[key] = query
 
-        cursor.execute(query, values)
-        conn.commit()
+    values = [updates[f] for f in valid_fields]
+    values.append(account_id)
 
-        if cursor.rowcount > 0:
-            logger.info(f"Updated account with ID {account_id}")
+    try:
+        with db_scope(write=True) as conn:
+            updated = conn.execute(query, values).rowcount
+        _invalidate_accounts_cache()
+        _mark_export_dirty("accounts")
+        if updated > 0:
+            logger.info("Updated account with ID %s", account_id)
             return True
-        else:
-            logger.warning(f"No account found with ID {account_id}")
-            return False
-
+        logger.warning("No account found with ID %s", account_id)
+        return False
     except sqlite3.Error as e:
-        logger.error(f"Error updating account with ID {account_id}: {e}")
-        if conn:
-            conn.rollback()
+        logger.error("Error updating account with ID %s: %s", account_id, e)
         return False
-    finally:
-        if conn:
-            close_connection(conn)
 
 def delete_account(account_id: int) -> bool:
     """Delete an account from the database.
@@ -230,40 +592,37 @@ def delete_account(account_id: int) -> bool:
     Returns:
         bool: True if deletion was successful, False otherwise
     """
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Check if account has transactions
-        cursor.execute(
-            "SELECT COUNT(*) FROM transactions WHERE account_id = ?",
-            (account_id,)
-        )
-        transaction_count = cursor.fetchone()[0]
-
-        if transaction_count > 0:
-            logger.warning(f"Cannot delete account {account_id} - it has {transaction_count} transactions")
-            return False
-
-        cursor.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
-        conn.commit()
-
-        if cursor.rowcount > 0:
-            logger.info(f"Deleted account with ID {account_id}")
+        with db_scope(write=True) as conn:
+            # Guarded single-statement delete: only fires when no transactions
+            # reference the account, replacing the old count-then-delete pair
+            deleted = conn.execute(
+                "DELETE FROM accounts WHERE id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM transactions WHERE account_id = ?)",
+                (account_id, account_id)
+            ).rowcount
+            if deleted > 0:
+                in_use = None
+            else:
+                # Rare failure path: one cheap probe tells "in use" from "not found"
+                in_use = conn.execute(
+                    "SELECT 1 FROM transactions WHERE account_id = ? LIMIT 1",
+                    (account_id,)
+                ).fetchone()
+
+        _invalidate_accounts_cache()
+        _mark_export_dirty("accounts")
+        if deleted > 0:
+            logger.info("Deleted account with ID %s", account_id)
             return True
+        if in_use:
+            logger.warning("Cannot delete account %s - it has transactions", account_id)
         else:
-            logger.warning(f"No account found with ID {account_id}")
-            return False
-
+            logger.warning("No account found with ID %s", account_id)
+        return False
     except sqlite3.Error as e:
-        logger.error(f"Error deleting account with ID {account_id}: {e}")
-        if conn:
-            conn.rollback()
+        logger.error("Error deleting account with ID %s: %s", account_id, e)
         return False
-    finally:
-        if conn:
-            close_connection(conn)
 
 def list_accounts() -> List[Dict[str, Any]]:
     """List all accounts in the database.
@@ -271,34 +630,24 @@ def list_accounts() -> List[Dict[str, Any]]:
     Returns:
         List of dictionaries containing account information
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Schema: id, name, type, virtual_balance, active
-        cursor.execute(
-            "SELECT id, name, type, virtual_balance, active FROM accounts ORDER BY name"
-        )
-
-        accounts = []
-        for row in cursor.fetchall():
-            accounts.append({
-                'id': row[0],
-                'name': row[1],
-                'type': row[2],
-                'balance': row[3],  # virtual_balance from schema
-                'active': row[4]
-            })
-
-        return accounts
+    global _accounts_cache
+    with _cache_lock:
+        if _accounts_cache is not None:
+            # Copy per row, not just the list: callers mutating a
+            # returned dict must not corrupt the cached entries
+            return [dict(acc) for acc in _accounts_cache]
 
+    try:
+        with db_scope() as conn:
+            # Schema: id, name, type, virtual_balance, active
+            rows = conn.execute(_SQL_LIST_ACCOUNTS).fetchall()
+        accounts = [dict(row) for row in rows]
+        with _cache_lock:
+            _accounts_cache = accounts
+        return [dict(acc) for acc in accounts]
     except sqlite3.Error as e:
-        logger.error(f"Error listing accounts: {e}")
+        logger.error("Error listing accounts: %s", e)
         return []
-    finally:
-        if conn:
-            close_connection(conn)
 
 def account_exists(name: str) -> bool:
     """Check if an account exists by name.
@@ -309,26 +658,24 @@ def account_exists(name: str) -> bool:
     Returns:
         bool: True if account exists, False otherwise
     """
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) FROM accounts WHERE name = ?", (name,))
-        count = cursor.fetchone()[0]
-
-        return count > 0
-
+        with db_scope() as conn:
+            # SELECT 1 ... LIMIT 1 stops at the first hit instead of counting
+            # every matching row; with the unique name index this is one
+            # B-tree probe
+            row = conn.execute("SELECT 1 FROM accounts WHERE name = ? LIMIT 1", (name,)).fetchone()
+        return row is not None
     except sqlite3.Error as e:
-        logger.error(f"Error checking account existence for '{name}': {e}")
+        logger.error("Error checking account existence for '%s': %s", name, e)
         return False
-    finally:
-        if conn:
-            close_connection(conn)
 
 # ======================
 # Category Management - TODO: Implement all functions
 # ======================
+_SQL_INSERT_CATEGORY = "INSERT INTO categories (name, type, emoji) VALUES (?, ?, ?)"
+_SQL_SELECT_CATEGORY_BY_ID = "SELECT id, name, type, emoji FROM categories WHERE id = ?"
+_SQL_SELECT_CATEGORY_BY_NAME = "SELECT id, name, type, emoji FROM categories WHERE name = ?"
+
 def add_category(name: str, category_type: str = "expense", emoji: str = None) -> int:
     """Add a new category to the database.
 
@@ -344,86 +691,100 @@ def add_category(name: str, category_type: str = "expense", emoji: str = None) -
         ValueError: If ``category_type`` is not 'income' or 'expense'.
         sqlite3.IntegrityError: If the category name already exists.
     """
-    normalized_type = category_type.strip().lower()
-    if normalized_type not in {"income", "expense"}:
+    normalized_type = _normalize_type(category_type)
+    if normalized_type not in _CATEGORY_TYPES:
         raise ValueError("category_type must be either 'income' or 'expense'")
 
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with db_scope(write=True) as conn:
+            category_id = _insert_row(conn, _SQL_INSERT_CATEGORY, (name, normalized_type, emoji))
+        _invalidate_categories_cache()
+        _mark_export_dirty("categories")
+        logger.info("Added category '%s' with ID %s", name, category_id)
+        return category_id
+    except sqlite3.Error as e:
+        logger.error("Error adding category '%s': %s", name, e)
+        raise
 
-        cursor.execute(
-            "INSERT INTO categories (name, type, emoji) VALUES (?, ?, ?)",
-            (name, normalized_type, emoji)
-        )
-        conn.commit()
+def add_categories_bulk(rows: List[Tuple[str, str, Optional[str]]]) -> int:
+    """Add many categories in a single transaction.
 
-        category_id = cursor.lastrowid
-        logger.info(f"Added category '{name}' with ID {category_id}")
-        return category_id
+    Args:
+        rows: List of (name, category_type, emoji) tuples.
 
+    Returns:
+        int: Number of categories inserted.
+
+    Raises:
+        ValueError: If any category type is not 'income' or 'expense'.
+        sqlite3.IntegrityError: If a category name already exists.
+    """
+    if not rows:
+        return 0
+
+    normalized = []
+    for name, category_type, emoji in rows:
+        category_type = _normalize_type(category_type)
+        if category_type not in _CATEGORY_TYPES:
+            raise ValueError("category_type must be either 'income' or 'expense'")
+        normalized.append((name, category_type, emoji))
+
+    try:
+        with db_scope(write=True) as conn:
+            inserted = bulk_insert(conn.cursor(), "categories", ("name", "type", "emoji"), normalized)
+        _invalidate_categories_cache()
+        _mark_export_dirty("categories")
+        logger.info("Added %s categor(ies) in bulk", inserted)
+        return inserted
     except sqlite3.Error as e:
-        logger.error(f"Error adding category '{name}': {e}")
-        if conn:
-            conn.rollback()
+        logger.error("Error bulk-adding categories: %s", e)
         raise
-    finally:
-        if conn:
-            close_connection(conn)
 
 def get_category(category_id: int) -> Optional[Dict[str, Any]]:
-    """Retrieve a category by ID."""
-    conn = None
+    """Retrieve a category by ID (read-through cached)."""
+    with _cache_lock:
+        cached = _category_cache.get(category_id)
+        if cached is not None:
+            return dict(cached)
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, name, type, emoji FROM categories WHERE id = ?",
-            (category_id,)
-        )
-        row = cursor.fetchone()
-        if row:
-            return {
-                "id": row[0],
-                "name": row[1],
-                "type": row[2],
-                "emoji": row[3],
-            }
-        return None
+        with db_scope() as conn:
+            row = conn.execute(_SQL_SELECT_CATEGORY_BY_ID, (category_id,)).fetchone()
+        if not row:
+            return None
+        category = dict(row)
+        with _cache_lock:
+            _category_cache[category_id] = category
+        return dict(category)
     except sqlite3.Error as e:
-        logger.error(f"Error fetching category {category_id}: {e}")
+        logger.error("Error fetching category %s: %s", category_id, e)
         return None
-    finally:
-        if conn:
-            close_connection(conn)
 
 
 def get_category_by_name(name: str) -> Optional[Dict[str, Any]]:
-    """Retrieve a category by its name."""
-    conn = None
+    """Retrieve a category by its name (read-through cached)."""
+    with _cache_lock:
+        cached = _category_name_cache.get(name)
+        if cached is not None:
+            return dict(cached)
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, name, type, emoji FROM categories WHERE name = ?",
-            (name,)
-        )
-        row = cursor.fetchone()
-        if row:
-            return {
-                "id": row[0],
-                "name": row[1],
-                "type": row[2],
-                "emoji": row[3],
-            }
-        return None
+        with db_scope() as conn:
+            row = conn.execute(_SQL_SELECT_CATEGORY_BY_NAME, (name,)).fetchone()
+        if not row:
+            return None
+        category = dict(row)
+        with _cache_lock:
+            _category_name_cache[name] = category
+        return dict(category)
     except sqlite3.Error as e:
-        logger.error(f"Error fetching category '{name}': {e}")
+        logger.error("Error fetching category '%s': %s", name, e)
         return None
-    finally:
-        if conn:
-            close_connection(conn)
+
+
+# SQL text per updated-field set, mirroring _UPDATE_SQL_CACHE for
+# accounts: the same field combination always yields the same string,
+# so SQLite's prepared-statement cache hits — and an explicit None
+# still writes NULL (a COALESCE form cannot clear a column)
+_CATEGORY_UPDATE_SQL_CACHE: Dict[frozenset, str] = {}
 
 
 def update_category(category_id: int, **updates) -> bool:
@@ -432,117 +793,118 @@ def update_category(category_id: int, **updates) -> bool:
         logger.warning("No updates provided for category")
         return False
 
-    set_parts: List[str] = []
-    values: List[Any] = []
+    valid_fields = [f for f in updates if f in _CATEGORY_UPDATE_FIELDS]
+    for field in updates:
+        if field not in _CATEGORY_UPDATE_FIELDS:
+            logger.warning("Ignoring invalid category field '%s'", field)
 
-    for field, value in updates.items():
-        if field == "type":
-            normalized = str(value).strip().lower()
-            if normalized not in {"income", "expense"}:
-                logger.warning("Invalid category type provided")
-                continue
-            set_parts.append("type = ?")
-            values.append(normalized)
-        elif field in {"name", "emoji"}:
-            set_parts.append(f"{field} = ?")
-            values.append(value)
-        else:
-            logger.warning(f"Ignoring invalid category field '{field}'")
+    category_type = None
+    if "type" in updates:
+        category_type = _normalize_type(str(updates["type"]))
+        if category_type not in _CATEGORY_TYPES:
+            logger.warning("Invalid category type provided")
+            category_type = None
+            valid_fields.remove("type")
 
-    if not set_parts:
+    if not valid_fields:
         logger.warning("No valid category fields to update")
         return False
 
+    valid_fields.sort()
+    key = frozenset(valid_fields)
+    query = _CATEGORY_UPDATE_SQL_CACHE.get(key)
+    if query is None:
+        set_clause = ", ".join(f"{f} = ?" for f in valid_fields)
+        query = f"UPDATE categories SET {set_clause} WHERE id = ?"
+        _CATEGORY_UPDATE_SQL_CACHE[key] = query
+
+    values = [
+        category_type if f == "type" else updates[f] for f in valid_fields
+    ]
     values.append(category_id)
 
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            f"UPDATE categories SET {', '.join(set_parts)} WHERE id = ?",
-            values,
-        )
-        conn.commit()
-        if cursor.rowcount:
-            logger.info(f"Updated category {category_id}")
+        with db_scope(write=True) as conn:
+            updated = conn.execute(query, values).rowcount
+        _invalidate_categories_cache()
+        _mark_export_dirty("categories")
+        if updated:
+            logger.info("Updated category %s", category_id)
             return True
-        logger.warning(f"No category found with ID {category_id}")
+        logger.warning("No category found with ID %s", category_id)
         return False
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error updating category {category_id}: {e}")
+        logger.error("Error updating category %s: %s", category_id, e)
         return False
-    finally:
-        if conn:
-            close_connection(conn)
 
 
 def delete_category(category_id: int) -> bool:
     """Delete a category if no transactions reference it."""
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT COUNT(*) FROM transactions WHERE category_id = ?",
-            (category_id,)
-        )
-        in_use = cursor.fetchone()[0]
-        if in_use:
-            logger.warning(
-                f"Cannot delete category {category_id} because it is used in {in_use} transactions"
-            )
-            return False
-
-        cursor.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-        conn.commit()
-        if cursor.rowcount:
-            logger.info(f"Deleted category {category_id}")
+        with db_scope(write=True) as conn:
+            # Guarded single-statement delete, mirroring delete_account
+            deleted = conn.execute(
+                "DELETE FROM categories WHERE id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM transactions WHERE category_id = ?)",
+                (category_id, category_id)
+            ).rowcount
+            if deleted:
+                in_use = None
+            else:
+                in_use = conn.execute(
+                    "SELECT 1 FROM transactions WHERE category_id = ? LIMIT 1",
+                    (category_id,)
+                ).fetchone()
+
+        _invalidate_categories_cache()
+        _mark_export_dirty("categories")
+        if deleted:
+            logger.info("Deleted category %s", category_id)
             return True
-        logger.warning(f"No category found with ID {category_id}")
+        if in_use:
+            logger.warning("Cannot delete category %s because it is used in transactions", category_id)
+        else:
+            logger.warning("No category found with ID %s", category_id)
         return False
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error deleting category {category_id}: {e}")
+        logger.error("Error deleting category %s: %s", category_id, e)
         return False
-    finally:
-        if conn:
-            close_connection(conn)
 
 
 def list_categories() -> List[Dict[str, Any]]:
     """List all categories."""
-    conn = None
+    global _categories_cache
+    with _cache_lock:
+        if _categories_cache is not None:
+            # Per-row copies, same rationale as list_accounts
+            return [dict(cat) for cat in _categories_cache]
+
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, name, type, emoji FROM categories ORDER BY type, name"
-        )
-        rows = cursor.fetchall()
-        return [
-            {
-                "id": row[0],
-                "name": row[1],
-                "type": row[2],
-                "emoji": row[3],
-            }
-            for row in rows
-        ]
+        with db_scope() as conn:
+            rows = conn.execute(
+                "SELECT id, name, type, emoji FROM categories ORDER BY type, name"
+            ).fetchall()
+        categories = [dict(row) for row in rows]
+        with _cache_lock:
+            _categories_cache = categories
+        return [dict(cat) for cat in categories]
     except sqlite3.Error as e:
-        logger.error(f"Error listing categories: {e}")
+        logger.error("Error listing categories: %s", e)
         return []
-    finally:
-        if conn:
-            close_connection(conn)
 
 # ======================
 # Transaction Management
 # ======================
+_SQL_INSERT_TRANSACTION = (
+    "INSERT INTO transactions "
+    "(account_id, category_id, amount, type, date, description, notes, is_recurring) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_SELECT_TRANSACTION = (
+    "SELECT id, account_id, category_id, amount, type, date, description, notes, is_recurring "
+    "FROM transactions WHERE id = ?"
+)
+
 def add_transaction(
     account_id: int,
     amount: float,
@@ -554,79 +916,123 @@ def add_transaction(
     is_recurring: bool = False,
 ) -> int:
     """Insert a new transaction row."""
-    normalized_type = txn_type.strip().lower()
-    if normalized_type not in {"income", "expense", "transfer"}:
+    normalized_type = _normalize_type(txn_type)
+    if normalized_type not in _TXN_TYPES:
         raise ValueError("txn_type must be 'income', 'expense', or 'transfer'")
 
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO transactions
-            (account_id, category_id, amount, type, date, description, notes, is_recurring)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                account_id,
-                category_id,
-                float(amount),
-                normalized_type,
-                date,
-                description,
-                notes,
-                1 if is_recurring else 0,
-            ),
-        )
-        conn.commit()
-        txn_id = cursor.lastrowid
-        logger.info(f"Added transaction {txn_id} ({normalized_type})")
+        with db_scope(write=True) as conn:
+            txn_id = _insert_row(
+                conn,
+                _SQL_INSERT_TRANSACTION,
+                (
+                    account_id,
+                    category_id,
+                    float(amount),
+                    normalized_type,
+                    date,
+                    description,
+                    notes,
+                    1 if is_recurring else 0,
+                ),
+            )
+        logger.info("Added transaction %s (%s)", txn_id, normalized_type)
         return txn_id
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error adding transaction: {e}")
+        logger.error("Error adding transaction: %s", e)
+        raise
+
+
+def add_transactions(rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert many transactions in one write transaction.
+
+    Importers calling add_transaction in a loop pay a commit (WAL fsync)
+    and statement dispatch per row; this normalizes every row up front
+    and runs a single executemany under one BEGIN IMMEDIATE/COMMIT.
+
+    Args:
+        rows: Dicts with the add_transaction fields (account_id, amount,
+            type, date, and optional category_id/description/notes/
+            is_recurring).
+
+    Returns:
+        List of new transaction IDs in input order.
+
+    Raises:
+        ValueError: If any row has an invalid type.
+        sqlite3.Error: If any insert fails; the whole batch rolls back.
+    """
+    if not rows:
+        return []
+
+    normalized = []
+    for row in rows:
+        txn_type = _normalize_type(str(row["type"]))
+        if txn_type not in _TXN_TYPES:
+            raise ValueError("txn_type must be 'income', 'expense', or 'transfer'")
+        normalized.append((
+            row["account_id"],
+            row.get("category_id"),
+            float(row["amount"]),
+            txn_type,
+            row["date"],
+            row.get("description", ""),
+            row.get("notes", ""),
+            1 if row.get("is_recurring") else 0,
+        ))
+
+    conn = get_connection()
+    try:
+        if not _uow_active():
+            conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.cursor()
+        cursor.executemany(_SQL_INSERT_TRANSACTION, normalized)
+        # The write lock is held for the whole batch, so the rowids are
+        # contiguous and the last one identifies the full range
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        _maybe_commit(conn)
+        logger.info("Added %s transaction(s) in bulk", len(normalized))
+        return list(range(last_id - len(normalized) + 1, last_id + 1))
+    except sqlite3.Error as e:
+        _maybe_rollback(conn)
+        logger.error("Error bulk-adding transactions: %s", e)
+        raise
+    except BaseException:
+        # Same as db_scope: non-sqlite errors must also release the
+        # open transaction before propagating
+        _maybe_rollback(conn)
         raise
-    finally:
-        if conn:
-            close_connection(conn)
 
 
 def get_transaction(transaction_id: int) -> Optional[Dict[str, Any]]:
     """Fetch a transaction by ID."""
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, account_id, category_id, amount, type, date, description, notes, is_recurring
-            FROM transactions
-            WHERE id = ?
-            """,
-            (transaction_id,)
-        )
-        row = cursor.fetchone()
+        with db_scope() as conn:
+            row = conn.execute(_SQL_SELECT_TRANSACTION, (transaction_id,)).fetchone()
         if row:
-            return {
-                "id": row[0],
-                "account_id": row[1],
-                "category_id": row[2],
-                "amount": row[3],
-                "type": row[4],
-                "date": row[5],
-                "description": row[6],
-                "notes": row[7],
-                "is_recurring": bool(row[8]),
-            }
+            txn = dict(row)
+            txn["is_recurring"] = bool(txn["is_recurring"])
+            return txn
         return None
     except sqlite3.Error as e:
-        logger.error(f"Error fetching transaction {transaction_id}: {e}")
+        logger.error("Error fetching transaction %s: %s", transaction_id, e)
         return None
-    finally:
-        if conn:
-            close_connection(conn)
+
+
+# SQL text per updated-field set, same rationale as
+# _CATEGORY_UPDATE_SQL_CACHE
+_TXN_UPDATE_SQL_CACHE: Dict[frozenset, str] = {}
+
+_TXN_UPDATE_FIELDS = frozenset({
+    "account_id",
+    "category_id",
+    "amount",
+    "type",
+    "date",
+    "description",
+    "notes",
+    "is_recurring",
+})
 
 
 def update_transaction(transaction_id: int, **updates) -> bool:
@@ -635,169 +1041,168 @@ def update_transaction(transaction_id: int, **updates) -> bool:
         logger.warning("No updates supplied for transaction")
         return False
 
-    allowed_fields = {
-        "account_id",
-        "category_id",
-        "amount",
-        "type",
-        "date",
-        "description",
-        "notes",
-        "is_recurring",
-    }
-
-    set_parts: List[str] = []
-    values: List[Any] = []
-
-    for field, value in updates.items():
-        if field not in allowed_fields:
-            logger.warning(f"Ignoring invalid transaction field '{field}'")
-            continue
-        if field == "type":
-            normalized = str(value).strip().lower()
-            if normalized not in {"income", "expense", "transfer"}:
-                logger.warning("Invalid transaction type provided")
-                continue
-            set_parts.append("type = ?")
-            values.append(normalized)
-        elif field == "amount":
-            set_parts.append("amount = ?")
-            values.append(float(value))
-        elif field == "is_recurring":
-            set_parts.append("is_recurring = ?")
-            values.append(1 if value else 0)
-        else:
-            set_parts.append(f"{field} = ?")
-            values.append(value)
+    valid_fields = [f for f in updates if f in _TXN_UPDATE_FIELDS]
+    for field in updates:
+        if field not in _TXN_UPDATE_FIELDS:
+            logger.warning("Ignoring invalid transaction field '%s'", field)
 
-    if not set_parts:
+    txn_type = None
+    if "type" in updates:
+        txn_type = _normalize_type(str(updates["type"]))
+        if txn_type not in _TXN_TYPES:
+            logger.warning("Invalid transaction type provided")
+            txn_type = None
+            valid_fields.remove("type")
+
+    if not valid_fields:
         logger.warning("No valid transaction fields to update")
         return False
 
+    valid_fields.sort()
+    key = frozenset(valid_fields)
+    query = _TXN_UPDATE_SQL_CACHE.get(key)
+    if query is None:
+        set_clause = ", ".join(f"{f} = ?" for f in valid_fields)
+        query = f"UPDATE transactions SET {set_clause} WHERE id = ?"
+        _TXN_UPDATE_SQL_CACHE[key] = query
+
+    def _txn_value(field: str) -> Any:
+        value = updates[field]
+        if field == "type":
+            return txn_type
+        if field == "amount":
+            return float(value) if value is not None else None
+        if field == "is_recurring":
+            return 1 if value else 0
+        return value
+
+    values = [_txn_value(f) for f in valid_fields]
     values.append(transaction_id)
 
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            f"UPDATE transactions SET {', '.join(set_parts)} WHERE id = ?",
-            values,
-        )
-        conn.commit()
-        if cursor.rowcount:
-            logger.info(f"Updated transaction {transaction_id}")
+        with db_scope(write=True) as conn:
+            updated = conn.execute(query, values).rowcount
+        if updated:
+            logger.info("Updated transaction %s", transaction_id)
             return True
-        logger.warning(f"No transaction found with ID {transaction_id}")
+        logger.warning("No transaction found with ID %s", transaction_id)
         return False
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error updating transaction {transaction_id}: {e}")
+        logger.error("Error updating transaction %s: %s", transaction_id, e)
         return False
-    finally:
-        if conn:
-            close_connection(conn)
 
 
 def delete_transaction(transaction_id: int) -> bool:
     """Delete a transaction if it is not referenced by transfers."""
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT COUNT(*) FROM transfers
-            WHERE from_transaction_id = ? OR to_transaction_id = ?
-            """,
-            (transaction_id, transaction_id)
-        )
-        linked = cursor.fetchone()[0]
+        with db_scope(write=True) as conn:
+            # Guarded single-statement delete: only fires when no transfer
+            # references the row, same shape as delete_account/_category
+            deleted = conn.execute(
+                "DELETE FROM transactions WHERE id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM transfers WHERE from_transaction_id = ? OR to_transaction_id = ?)",
+                (transaction_id, transaction_id, transaction_id)
+            ).rowcount
+            if deleted:
+                linked = None
+            else:
+                # Rare failure path: one cheap probe tells "in use" from "not found"
+                linked = conn.execute(
+                    "SELECT 1 FROM transfers "
+                    "WHERE from_transaction_id = ? OR to_transaction_id = ? LIMIT 1",
+                    (transaction_id, transaction_id)
+                ).fetchone()
+        if deleted:
+            logger.info("Deleted transaction %s", transaction_id)
+            return True
         if linked:
             logger.warning(
-                f"Cannot delete transaction {transaction_id}; referenced in {linked} transfer record(s)"
+                "Cannot delete transaction %s; referenced by transfer record(s)",
+                transaction_id
             )
-            return False
-
-        cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
-        conn.commit()
-        if cursor.rowcount:
-            logger.info(f"Deleted transaction {transaction_id}")
-            return True
-        logger.warning(f"No transaction found with ID {transaction_id}")
+        else:
+            logger.warning("No transaction found with ID %s", transaction_id)
         return False
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error deleting transaction {transaction_id}: {e}")
+        logger.error("Error deleting transaction %s: %s", transaction_id, e)
         return False
-    finally:
-        if conn:
-            close_connection(conn)
 
 
-def list_transactions(
+def iter_transactions(
     account_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     limit: int = 100,
-) -> List[Dict[str, Any]]:
-    """Return a list of transactions filtered by optional parameters."""
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        conditions: List[str] = []
-        params: List[Any] = []
+    before_date: Optional[str] = None,
+    before_id: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield transactions filtered by optional parameters.
+
+    Streams rows in fetchmany batches, so peak memory stays bounded by
+    the batch size no matter how large the limit is — analytics callers
+    should prefer this over list_transactions.
+
+    For paging past the first ``limit`` rows, pass the last row's date
+    and id as ``before_date``/``before_id``: the keyset predicate seeks
+    straight into idx_tx_date_id instead of scanning and discarding an
+    OFFSET's worth of rows.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+
+    if account_id is not None:
+        conditions.append("account_id = ?")
+        params.append(account_id)
+    if start_date is not None:
+        conditions.append("date >= ?")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("date <= ?")
+        params.append(end_date)
+    if before_date is not None and before_id is not None:
+        # Keyset cursor: continue strictly after the last row the caller saw
+        conditions.append("(date, id) < (?, ?)")
+        params.extend([before_date, before_id])
+
+    where_clause = ""
+    if conditions:
+        where_clause = " WHERE " + " AND ".join(conditions)
+
+    query = (
+        "SELECT id, account_id, category_id, amount, type, date, description, notes, is_recurring "
+        "FROM transactions"
+        f"{where_clause} "
+        "ORDER BY date DESC, id DESC "
+        "LIMIT ?"
+    )
+    params.append(limit)
 
-        if account_id is not None:
-            conditions.append("account_id = ?")
-            params.append(account_id)
-        if start_date is not None:
-            conditions.append("date >= ?")
-            params.append(start_date)
-        if end_date is not None:
-            conditions.append("date <= ?")
-            params.append(end_date)
+    try:
+        cursor = get_connection().execute(query, params)
+        while True:
+            chunk = cursor.fetchmany(_ITER_BATCH)
+            if not chunk:
+                break
+            for row in chunk:
+                txn = dict(row)
+                txn["is_recurring"] = bool(txn["is_recurring"])
+                yield txn
+    except sqlite3.Error as e:
+        logger.error("Error listing transactions: %s", e)
 
-        where_clause = ""
-        if conditions:
-            where_clause = " WHERE " + " AND ".join(conditions)
 
-        query = (
-            "SELECT id, account_id, category_id, amount, type, date, description, notes, is_recurring "
-            "FROM transactions"
-            f"{where_clause} "
-            "ORDER BY date DESC, id DESC "
-            "LIMIT ?"
-        )
-        params.append(limit)
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        return [
-            {
-                "id": row[0],
-                "account_id": row[1],
-                "category_id": row[2],
-                "amount": row[3],
-                "type": row[4],
-                "date": row[5],
-                "description": row[6],
-                "notes": row[7],
-                "is_recurring": bool(row[8]),
-            }
-            for row in rows
-        ]
-    except sqlite3.Error as e:
-        logger.error(f"Error listing transactions: {e}")
-        return []
-    finally:
-        if conn:
-            close_connection(conn)
+def list_transactions(
+    account_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 100,
+    before_date: Optional[str] = None,
+    before_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Return a list of transactions; see iter_transactions for paging."""
+    return list(iter_transactions(
+        account_id, start_date, end_date, limit, before_date, before_id
+    ))
 
 # ======================
 # Transfer Management
@@ -815,161 +1220,218 @@ def add_transfer(
     if amount <= 0:
         raise ValueError("Transfer amount must be positive")
 
-    conn = None
+    conn = get_connection()
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Debit from source account (negative amount)
-        cursor.execute(
-            """
-            INSERT INTO transactions
-            (account_id, category_id, amount, type, date, description, notes, is_recurring)
-            VALUES (?, NULL, ?, 'transfer', ?, ?, ?, 0)
-            """,
-            (
-                from_account_id,
-                -abs(float(amount)),
-                date,
-                description,
-                notes,
-            ),
-        )
-        debit_id = cursor.lastrowid
-
-        # Credit to destination account (positive amount)
-        cursor.execute(
-            """
-            INSERT INTO transactions
-            (account_id, category_id, amount, type, date, description, notes, is_recurring)
-            VALUES (?, NULL, ?, 'transfer', ?, ?, ?, 0)
-            """,
-            (
-                to_account_id,
-                abs(float(amount)),
-                date,
-                description,
-                notes,
-            ),
-        )
-        credit_id = cursor.lastrowid
-
-        cursor.execute(
-            """
-            INSERT INTO transfers (from_transaction_id, to_transaction_id)
-            VALUES (?, ?)
-            """,
-            (debit_id, credit_id),
+        # Take the write lock up front: one journal flush covers all
+        # three INSERTs, and the transaction can't hit a mid-flight
+        # lock upgrade under concurrent writers
+        if not _uow_active():
+            conn.execute("BEGIN IMMEDIATE")
+        transfer_id, debit_id, credit_id = _insert_transfer_rows(
+            conn.cursor(), from_account_id, to_account_id, amount, date, description, notes
         )
-        transfer_id = cursor.lastrowid
-
-        conn.commit()
+        _maybe_commit(conn)
         logger.info(
-            f"Created transfer {transfer_id}: debit {debit_id} -> credit {credit_id} ({amount})"
+            "Created transfer %s: debit %s -> credit %s (%s)",
+            transfer_id, debit_id, credit_id, amount
         )
         return transfer_id, debit_id, credit_id
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error creating transfer: {e}")
+        _maybe_rollback(conn)
+        logger.error("Error creating transfer: %s", e)
+        raise
+    except BaseException:
+        # Same as db_scope: non-sqlite errors must also release the
+        # open transaction before propagating
+        _maybe_rollback(conn)
         raise
-    finally:
-        if conn:
-            close_connection(conn)
 
 
-def get_transfer(transfer_id: int) -> Optional[Dict[str, Any]]:
-    """Fetch a transfer record with its linked transactions."""
-    conn = None
+def _insert_transfer_rows(
+    cursor: sqlite3.Cursor,
+    from_account_id: int,
+    to_account_id: int,
+    amount: float,
+    date: str,
+    description: str,
+    notes: str,
+) -> Tuple[int, int, int]:
+    """Insert one debit/credit/link triple on the caller's open transaction."""
+    # Debit from source account (negative amount)
+    cursor.execute(
+        """
+        INSERT INTO transactions
+        (account_id, category_id, amount, type, date, description, notes, is_recurring)
+        VALUES (?, NULL, ?, 'transfer', ?, ?, ?, 0)
+        """,
+        (from_account_id, -abs(float(amount)), date, description, notes),
+    )
+    debit_id = cursor.lastrowid
+
+    # Credit to destination account (positive amount)
+    cursor.execute(
+        """
+        INSERT INTO transactions
+        (account_id, category_id, amount, type, date, description, notes, is_recurring)
+        VALUES (?, NULL, ?, 'transfer', ?, ?, ?, 0)
+        """,
+        (to_account_id, abs(float(amount)), date, description, notes),
+    )
+    credit_id = cursor.lastrowid
+
+    cursor.execute(
+        "INSERT INTO transfers (from_transaction_id, to_transaction_id) VALUES (?, ?)",
+        (debit_id, credit_id),
+    )
+    return cursor.lastrowid, debit_id, credit_id
+
+
+def add_transfers_bulk(rows: List[Tuple]) -> List[Tuple[int, int, int]]:
+    """Create many transfers under one BEGIN IMMEDIATE/COMMIT.
+
+    One write transaction (one WAL fsync) covers every transfer instead
+    of one commit per transfer, which dominates bulk import time.
+
+    Args:
+        rows: Tuples of (from_account_id, to_account_id, amount, date)
+            optionally followed by description and notes.
+
+    Returns:
+        List of (transfer_id, debit_id, credit_id) tuples in input order.
+
+    Raises:
+        ValueError: If any amount is not positive.
+        sqlite3.Error: If any insert fails; the whole batch rolls back.
+    """
+    if not rows:
+        return []
+
+    for row in rows:
+        if row[2] <= 0:
+            raise ValueError("Transfer amount must be positive")
+
+    conn = get_connection()
     try:
-        conn = get_connection()
+        if not _uow_active():
+            conn.execute("BEGIN IMMEDIATE")
         cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, from_transaction_id, to_transaction_id
-            FROM transfers
-            WHERE id = ?
-            """,
-            (transfer_id,)
-        )
-        link_row = cursor.fetchone()
-        if not link_row:
-            return None
+        results = []
+        for row in rows:
+            from_account_id, to_account_id, amount, date = row[:4]
+            description = row[4] if len(row) > 4 else ""
+            notes = row[5] if len(row) > 5 else ""
+            results.append(
+                _insert_transfer_rows(
+                    cursor, from_account_id, to_account_id, amount, date, description, notes
+                )
+            )
+        _maybe_commit(conn)
+        logger.info("Created %s transfer(s) in bulk", len(results))
+        return results
+    except sqlite3.Error as e:
+        _maybe_rollback(conn)
+        logger.error("Error bulk-creating transfers: %s", e)
+        raise
+    except BaseException:
+        # Same as db_scope: non-sqlite errors must also release the
+        # open transaction before propagating
+        _maybe_rollback(conn)
+        raise
+
 
-        result = {
-            "id": link_row[0],
-            "from_transaction": get_transaction(link_row[1]),
-            "to_transaction": get_transaction(link_row[2]),
-        }
-        return result
+# Both sides of a transfer in one statement; the ft_/tt_ prefixes are
+# stripped when slicing the row into the nested transaction dicts
+_TRANSFER_COLUMNS = "id, account_id, category_id, amount, type, date, description, notes, is_recurring"
+_SQL_SELECT_TRANSFER = (
+    "SELECT tr.id, "
+    + ", ".join(f"ft.{c}" for c in _TRANSFER_COLUMNS.split(", "))
+    + ", "
+    + ", ".join(f"tt.{c}" for c in _TRANSFER_COLUMNS.split(", "))
+    + " FROM transfers tr "
+    "JOIN transactions ft ON ft.id = tr.from_transaction_id "
+    "JOIN transactions tt ON tt.id = tr.to_transaction_id "
+)
+_TRANSFER_FIELDS = _TRANSFER_COLUMNS.split(", ")
+
+
+def _transfer_row_to_dict(row) -> Dict[str, Any]:
+    """Slice one joined transfer row into nested transaction dicts."""
+    n = len(_TRANSFER_FIELDS)
+    from_txn = dict(zip(_TRANSFER_FIELDS, row[1:1 + n]))
+    to_txn = dict(zip(_TRANSFER_FIELDS, row[1 + n:1 + 2 * n]))
+    from_txn["is_recurring"] = bool(from_txn["is_recurring"])
+    to_txn["is_recurring"] = bool(to_txn["is_recurring"])
+    return {"id": row[0], "from_transaction": from_txn, "to_transaction": to_txn}
+
+
+def get_transfer(transfer_id: int) -> Optional[Dict[str, Any]]:
+    """Fetch a transfer record with its linked transactions."""
+    try:
+        with db_scope() as conn:
+            row = conn.execute(
+                _SQL_SELECT_TRANSFER + "WHERE tr.id = ?",
+                (transfer_id,)
+            ).fetchone()
+        return _transfer_row_to_dict(row) if row else None
     except sqlite3.Error as e:
-        logger.error(f"Error fetching transfer {transfer_id}: {e}")
+        logger.error("Error fetching transfer %s: %s", transfer_id, e)
         return None
-    finally:
-        if conn:
-            close_connection(conn)
 
 
-def list_transfers(
+def iter_transfers(
     account_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     limit: int = 100,
-) -> List[Dict[str, Any]]:
-    """List transfers with optional filters."""
+) -> Iterator[Dict[str, Any]]:
+    """Yield transfers with optional filters, streamed in batches."""
+    conditions: List[str] = []
+    params: List[Any] = []
+
+    if account_id is not None:
+        conditions.append("(ft.account_id = ? OR tt.account_id = ?)")
+        params.extend([account_id, account_id])
+    if start_date is not None:
+        conditions.append("ft.date >= ?")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append("ft.date <= ?")
+        params.append(end_date)
+
+    where_clause = ""
+    if conditions:
+        where_clause = "WHERE " + " AND ".join(conditions) + " "
+
+    # One JOIN pulls both linked transactions per transfer; the old
+    # shape fetched each side with its own get_transaction call, 2N
+    # extra statements per page
+    query = (
+        _SQL_SELECT_TRANSFER
+        + where_clause
+        + "ORDER BY ft.date DESC, tr.id DESC LIMIT ?"
+    )
+    params.append(limit)
 
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        conditions: List[str] = []
-        params: List[Any] = []
+        cursor = get_connection().execute(query, params)
+        while True:
+            chunk = cursor.fetchmany(_ITER_BATCH)
+            if not chunk:
+                break
+            for row in chunk:
+                yield _transfer_row_to_dict(row)
+    except sqlite3.Error as e:
+        logger.error("Error listing transfers: %s", e)
 
-        if account_id is not None:
-            conditions.append(
-                "(ft.account_id = ? OR tt.account_id = ?)"
-            )
-            params.extend([account_id, account_id])
-        if start_date is not None:
-            conditions.append("ft.date >= ?")
-            params.append(start_date)
-        if end_date is not None:
-            conditions.append("ft.date <= ?")
-            params.append(end_date)
-
-        where_clause = ""
-        if conditions:
-            where_clause = " WHERE " + " AND ".join(conditions)
 
-        query = (
-            "SELECT tr.id, tr.from_transaction_id, tr.to_transaction_id "
-            "FROM transfers tr "
-            "JOIN transactions ft ON ft.id = tr.from_transaction_id "
-            "JOIN transactions tt ON tt.id = tr.to_transaction_id "
-            f"{where_clause} "
-            "ORDER BY ft.date DESC, tr.id DESC "
-            "LIMIT ?"
-        )
-        params.append(limit)
-
-        cursor.execute(query, params)
-        transfers = []
-        for row in cursor.fetchall():
-            transfers.append(
-                {
-                    "id": row[0],
-                    "from_transaction": get_transaction(row[1]),
-                    "to_transaction": get_transaction(row[2]),
-                }
-            )
-        return transfers
-    except sqlite3.Error as e:
-        logger.error(f"Error listing transfers: {e}")
-        return []
-    finally:
-        if conn:
-            close_connection(conn)
+def list_transfers(
+    account_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """List transfers with optional filters."""
+    return list(iter_transfers(account_id, start_date, end_date, limit))
 
 # ======================
 # Bill Management
@@ -986,22 +1448,18 @@ def add_bill(
     conn = None
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO bills (name, amount, due_date, repeat_freq, account_id)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+        bill_id = _insert_row(
+            conn,
+            "INSERT INTO bills (name, amount, due_date, repeat_freq, account_id) VALUES (?, ?, ?, ?, ?)",
             (name, float(amount), due_date, repeat_freq, account_id),
         )
-        conn.commit()
-        bill_id = cursor.lastrowid
-        logger.info(f"Added bill '{name}' with ID {bill_id}")
+        _maybe_commit(conn)
+        logger.info("Added bill '%s' with ID %s", name, bill_id)
         return bill_id
     except sqlite3.Error as e:
         if conn:
-            conn.rollback()
-        logger.error(f"Error adding bill '{name}': {e}")
+            _maybe_rollback(conn)
+        logger.error("Error adding bill '%s': %s", name, e)
         raise
     finally:
         if conn:
@@ -1019,72 +1477,60 @@ def get_bill(bill_id: int) -> Optional[Dict[str, Any]]:
             (bill_id,),
         )
         row = cursor.fetchone()
-        if row:
-            return {
-                "id": row[0],
-                "name": row[1],
-                "amount": row[2],
-                "due_date": row[3],
-                "repeat_freq": row[4],
-                "account_id": row[5],
-            }
-        return None
+        return dict(row) if row else None
     except sqlite3.Error as e:
-        logger.error(f"Error fetching bill {bill_id}: {e}")
+        logger.error("Error fetching bill %s: %s", bill_id, e)
         return None
     finally:
         if conn:
             close_connection(conn)
 
 
+# SQL text per updated-field set, same rationale as
+# _CATEGORY_UPDATE_SQL_CACHE
+_BILL_UPDATE_SQL_CACHE: Dict[frozenset, str] = {}
+
+
 def update_bill(bill_id: int, **updates) -> bool:
     """Update bill fields."""
     if not updates:
         logger.warning("No updates provided for bill")
         return False
 
-    allowed_fields = {"name", "amount", "due_date", "repeat_freq", "account_id"}
-    set_parts: List[str] = []
-    values: List[Any] = []
-
-    for field, value in updates.items():
-        if field not in allowed_fields:
-            logger.warning(f"Ignoring invalid bill field '{field}'")
-            continue
-        set_parts.append(f"{field} = ?")
-        if field == "amount":
-            values.append(float(value))
-        else:
-            values.append(value)
+    valid_fields = [f for f in updates if f in _BILL_UPDATE_FIELDS]
+    for field in updates:
+        if field not in _BILL_UPDATE_FIELDS:
+            logger.warning("Ignoring invalid bill field '%s'", field)
 
-    if not set_parts:
+    if not valid_fields:
         logger.warning("No valid bill fields to update")
         return False
 
+    valid_fields.sort()
+    key = frozenset(valid_fields)
+    query = _BILL_UPDATE_SQL_CACHE.get(key)
+    if query is None:
+        set_clause = ", ".join(f"{f} = ?" for f in valid_fields)
+        query = f"UPDATE bills SET {set_clause} WHERE id = ?"
+        _BILL_UPDATE_SQL_CACHE[key] = query
+
+    values = [
+        float(updates[f]) if f == "amount" and updates[f] is not None else updates[f]
+        for f in valid_fields
+    ]
     values.append(bill_id)
 
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            f"UPDATE bills SET {', '.join(set_parts)} WHERE id = ?",
-            values,
-        )
-        conn.commit()
-        if cursor.rowcount:
-            logger.info(f"Updated bill {bill_id}")
+        with db_scope(write=True) as conn:
+            updated = conn.execute(query, values).rowcount
+        if updated:
+            logger.info("Updated bill %s", bill_id)
             return True
-        logger.warning(f"No bill found with ID {bill_id}")
+        logger.warning("No bill found with ID %s", bill_id)
         return False
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error updating bill {bill_id}: {e}")
+        logger.error("Error updating bill %s: %s", bill_id, e)
         return False
-    finally:
-        if conn:
-            close_connection(conn)
 
 
 def delete_bill(bill_id: int) -> bool:
@@ -1094,61 +1540,75 @@ def delete_bill(bill_id: int) -> bool:
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("DELETE FROM bills WHERE id = ?", (bill_id,))
-        conn.commit()
+        _maybe_commit(conn)
         if cursor.rowcount:
-            logger.info(f"Deleted bill {bill_id}")
+            logger.info("Deleted bill %s", bill_id)
             return True
-        logger.warning(f"No bill found with ID {bill_id}")
+        logger.warning("No bill found with ID %s", bill_id)
         return False
     except sqlite3.Error as e:
         if conn:
-            conn.rollback()
-        logger.error(f"Error deleting bill {bill_id}: {e}")
+            _maybe_rollback(conn)
+        logger.error("Error deleting bill %s: %s", bill_id, e)
         return False
     finally:
         if conn:
             close_connection(conn)
 
 
+def iter_bills(account_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield bills optionally filtered by account, streamed in batches."""
+    if account_id is None:
+        query = "SELECT id, name, amount, due_date, repeat_freq, account_id FROM bills ORDER BY due_date"
+        params: Tuple = ()
+    else:
+        query = (
+            "SELECT id, name, amount, due_date, repeat_freq, account_id "
+            "FROM bills WHERE account_id = ? ORDER BY due_date"
+        )
+        params = (account_id,)
+
+    try:
+        cursor = get_connection().execute(query, params)
+        while True:
+            chunk = cursor.fetchmany(_ITER_BATCH)
+            if not chunk:
+                break
+            for row in chunk:
+                yield dict(row)
+    except sqlite3.Error as e:
+        logger.error("Error listing bills: %s", e)
+
+
 def list_bills(account_id: Optional[int] = None) -> List[Dict[str, Any]]:
     """List bills optionally filtered by account."""
-    conn = None
+    return list(iter_bills(account_id))
+
+def get_upcoming_bills(days_ahead: int = 7) -> List[Dict[str, Any]]:
+    """List bills due within the next ``days_ahead`` days.
+
+    The date bound is computed in Python and bound as a plain ISO
+    string, so SQLite runs a direct range scan on idx_bills_due instead
+    of evaluating a date('now', ...) modifier per execution.
+
+    Args:
+        days_ahead: How many days into the future to look. Defaults to 7.
+
+    Returns:
+        List of bill dictionaries ordered by due date.
+    """
+    bound = (date.today() + timedelta(days=days_ahead)).isoformat()
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        if account_id is None:
-            cursor.execute(
-                "SELECT id, name, amount, due_date, repeat_freq, account_id FROM bills ORDER BY due_date"
-            )
-            rows = cursor.fetchall()
-        else:
-            cursor.execute(
-                """
-                SELECT id, name, amount, due_date, repeat_freq, account_id
-                FROM bills
-                WHERE account_id = ?
-                ORDER BY due_date
-                """,
-                (account_id,),
-            )
-            rows = cursor.fetchall()
-        return [
-            {
-                "id": row[0],
-                "name": row[1],
-                "amount": row[2],
-                "due_date": row[3],
-                "repeat_freq": row[4],
-                "account_id": row[5],
-            }
-            for row in rows
-        ]
+        with db_scope() as conn:
+            rows = conn.execute(
+                "SELECT id, name, amount, due_date, repeat_freq, account_id "
+                "FROM bills WHERE due_date <= ? ORDER BY due_date",
+                (bound,),
+            ).fetchall()
+        return [dict(row) for row in rows]
     except sqlite3.Error as e:
-        logger.error(f"Error listing bills: {e}")
+        logger.error("Error listing upcoming bills: %s", e)
         return []
-    finally:
-        if conn:
-            close_connection(conn)
 
 # ======================
 # Subscription Management
@@ -1163,77 +1623,56 @@ def add_subscription(
     active: bool = True,
 ) -> int:
     """Insert a new subscription."""
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO subscriptions
-            (name, frequency, next_due_date, account_id, category_id, last_posted_date, active)
-            VALUES (?, ?, ?, ?, ?, NULL, ?)
-            """,
-            (name, frequency, next_due_date, account_id, category_id, 1 if active else 0),
-        )
-        subscription_id = cursor.lastrowid
-
-        # Store amount as a transaction template via notes if provided
-        if amount is not None:
-            cursor.execute(
-                """
-                UPDATE subscriptions
-                SET last_posted_date = ?
-                WHERE id = ?
-                """,
-                (f"AMOUNT:{amount}", subscription_id),
+        with db_scope(write=True) as conn:
+            # One parameterized INSERT carries the amount directly; the
+            # old shape ran a second UPDATE that stashed "AMOUNT:<x>" in
+            # last_posted_date, paying an extra statement per add
+            subscription_id = _insert_row(
+                conn,
+                "INSERT INTO subscriptions"
+                " (name, frequency, next_due_date, account_id, category_id, amount, last_posted_date, active)"
+                " VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+                (
+                    name,
+                    frequency,
+                    next_due_date,
+                    account_id,
+                    category_id,
+                    float(amount) if amount is not None else None,
+                    1 if active else 0,
+                ),
             )
-
-        conn.commit()
-        logger.info(f"Added subscription '{name}' with ID {subscription_id}")
+        _invalidate_subscriptions_cache()
+        logger.info("Added subscription '%s' with ID %s", name, subscription_id)
         return subscription_id
     except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error adding subscription '{name}': {e}")
+        logger.error("Error adding subscription '%s': %s", name, e)
         raise
-    finally:
-        if conn:
-            close_connection(conn)
 
 
 def get_subscription(subscription_id: int) -> Optional[Dict[str, Any]]:
-    """Fetch a subscription by ID."""
-    conn = None
+    """Fetch a subscription by ID (read-through cached)."""
+    with _cache_lock:
+        cached = _subscription_cache.get(subscription_id)
+        if cached is not None:
+            return dict(cached)
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, name, frequency, next_due_date, account_id, category_id, last_posted_date, active
-            FROM subscriptions
-            WHERE id = ?
-            """,
+        row = get_connection().execute(
+            "SELECT id, name, frequency, next_due_date, account_id, category_id,"
+            " amount, last_posted_date, active FROM subscriptions WHERE id = ?",
             (subscription_id,),
-        )
-        row = cursor.fetchone()
+        ).fetchone()
         if row:
-            return {
-                "id": row[0],
-                "name": row[1],
-                "frequency": row[2],
-                "next_due_date": row[3],
-                "account_id": row[4],
-                "category_id": row[5],
-                "last_posted_date": row[6],
-                "active": bool(row[7]),
-            }
+            subscription = dict(row)
+            subscription["active"] = bool(subscription["active"])
+            with _cache_lock:
+                _subscription_cache[subscription_id] = subscription
+            return dict(subscription)
         return None
     except sqlite3.Error as e:
-        logger.error(f"Error fetching subscription {subscription_id}: {e}")
+        logger.error("Error fetching subscription %s: %s", subscription_id, e)
         return None
-    finally:
-        if conn:
-            close_connection(conn)
 
 
 def update_subscription(subscription_id: int, **updates) -> bool:
@@ -1242,53 +1681,48 @@ def update_subscription(subscription_id: int, **updates) -> bool:
         logger.warning("No updates provided for subscription")
         return False
 
-    allowed_fields = {
-        "name",
-        "frequency",
-        "next_due_date",
-        "account_id",
-        "category_id",
-        "last_posted_date",
-        "active",
-    }
-    set_parts: List[str] = []
-    values: List[Any] = []
-
-    for field, value in updates.items():
-        if field not in allowed_fields:
-            logger.warning(f"Ignoring invalid subscription field '{field}'")
-            continue
-        if field == "active":
-            set_parts.append("active = ?")
-            values.append(1 if value else 0)
-        else:
-            set_parts.append(f"{field} = ?")
-            values.append(value)
+    # Sorted fields make the same field set yield the same SQL string
+    # and value order, so repeat callers hit the cached statement text
+    # (and SQLite's prepared-statement cache) instead of re-planning a
+    # fresh f-string variant per call
+    valid_fields = sorted(f for f in updates if f in _SUBSCRIPTION_UPDATE_FIELDS)
+    for field in updates:
+        if field not in _SUBSCRIPTION_UPDATE_FIELDS:
+            logger.warning("Ignoring invalid subscription field '%s'", field)
 
-    if not set_parts:
+    if not valid_fields:
         logger.warning("No valid subscription fields to update")
         return False
 
+    key = frozenset(valid_fields)
+    query = _SUBSCRIPTION_UPDATE_SQL_CACHE.get(key)
+    if query is None:
+        set_clause = ", ".join(f"{f} = ?" for f in valid_fields)
+        query = f"UPDATE subscriptions SET {set_clause} WHERE id = ?"
+        _SUBSCRIPTION_UPDATE_SQL_CACHE[key] = query
+
+    values = [
+        (1 if updates[f] else 0) if f == "active" else updates[f]
+        for f in valid_fields
+    ]
     values.append(subscription_id)
 
     conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
-        cursor.execute(
-            f"UPDATE subscriptions SET {', '.join(set_parts)} WHERE id = ?",
-            values,
-        )
-        conn.commit()
+        cursor.execute(query, values)
+        _maybe_commit(conn)
         if cursor.rowcount:
-            logger.info(f"Updated subscription {subscription_id}")
+            _invalidate_subscriptions_cache()
+            logger.info("Updated subscription %s", subscription_id)
             return True
-        logger.warning(f"No subscription found with ID {subscription_id}")
+        logger.warning("No subscription found with ID %s", subscription_id)
         return False
     except sqlite3.Error as e:
         if conn:
-            conn.rollback()
-        logger.error(f"Error updating subscription {subscription_id}: {e}")
+            _maybe_rollback(conn)
+        logger.error("Error updating subscription %s: %s", subscription_id, e)
         return False
     finally:
         if conn:
@@ -1302,16 +1736,17 @@ def delete_subscription(subscription_id: int) -> bool:
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("DELETE FROM subscriptions WHERE id = ?", (subscription_id,))
-        conn.commit()
+        _maybe_commit(conn)
         if cursor.rowcount:
-            logger.info(f"Deleted subscription {subscription_id}")
+            _invalidate_subscriptions_cache()
+            logger.info("Deleted subscription %s", subscription_id)
             return True
-        logger.warning(f"No subscription found with ID {subscription_id}")
+        logger.warning("No subscription found with ID %s", subscription_id)
         return False
     except sqlite3.Error as e:
         if conn:
-            conn.rollback()
-        logger.error(f"Error deleting subscription {subscription_id}: {e}")
+            _maybe_rollback(conn)
+        logger.error("Error deleting subscription %s: %s", subscription_id, e)
         return False
     finally:
         if conn:
@@ -1320,51 +1755,64 @@ def delete_subscription(subscription_id: int) -> bool:
 
 def list_subscriptions(active_only: bool = True) -> List[Dict[str, Any]]:
     """List subscriptions, optionally filtering active ones."""
-    conn = None
+    with _cache_lock:
+        cached = _subscriptions_list_cache.get(active_only)
+        if cached is not None:
+            return [dict(sub) for sub in cached]
+
+    # One query with a conditional WHERE instead of two duplicated
+    # SELECT literals; iterating the cursor skips the fetchall list
+    query = (
+        "SELECT id, name, frequency, next_due_date, account_id, category_id,"
+        " amount, last_posted_date, active FROM subscriptions"
+        + (" WHERE active = 1" if active_only else "")
+        + " ORDER BY next_due_date"
+    )
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        if active_only:
-            cursor.execute(
-                """
-                SELECT id, name, frequency, next_due_date, account_id, category_id, last_posted_date, active
-                FROM subscriptions
-                WHERE active = 1
-                ORDER BY next_due_date
-                """
-            )
-        else:
-            cursor.execute(
-                """
-                SELECT id, name, frequency, next_due_date, account_id, category_id, last_posted_date, active
-                FROM subscriptions
-                ORDER BY next_due_date
-                """
-            )
-        rows = cursor.fetchall()
-        return [
-            {
-                "id": row[0],
-                "name": row[1],
-                "frequency": row[2],
-                "next_due_date": row[3],
-                "account_id": row[4],
-                "category_id": row[5],
-                "last_posted_date": row[6],
-                "active": bool(row[7]),
-            }
-            for row in rows
-        ]
+        subscriptions = [dict(row) for row in get_connection().execute(query)]
+        for sub in subscriptions:
+            sub["active"] = bool(sub["active"])
+        with _cache_lock:
+            _subscriptions_list_cache[active_only] = subscriptions
+        return [dict(sub) for sub in subscriptions]
     except sqlite3.Error as e:
-        logger.error(f"Error listing subscriptions: {e}")
+        logger.error("Error listing subscriptions: %s", e)
         return []
-    finally:
-        if conn:
-            close_connection(conn)
 
 # ======================
 # Helper Functions
 # ======================
+# Account emoji by type for the accounts export (the accounts table has
+# no emoji column, but cloud_bot reads one from accounts.json). Built
+# once at module scope so exports don't rebuild the dict literal per call.
+_EMOJI_BY_TYPE = {
+    "cash": "💰",
+    "bank": "🏦",
+    "credit_card": "💳",
+    "wallet": "👛",
+}
+_DEFAULT_EMOJI = "💰"
+
+# Export queries and target filenames, built once at import
+_EXPORT_MAP = {
+    "accounts": (
+        "SELECT id, name, type, virtual_balance AS balance, active FROM accounts ORDER BY name",
+        "accounts.json",
+    ),
+    "categories": (
+        "SELECT id, name, type, COALESCE(emoji, '') AS emoji FROM categories ORDER BY type, name",
+        "categories.json",
+    ),
+    "bills": (
+        "SELECT id, name, amount, due_date, repeat_freq, account_id FROM bills ORDER BY due_date",
+        "bills.json",
+    ),
+    "subscriptions": (
+        "SELECT id, name, frequency, next_due_date, account_id, category_id, amount, last_posted_date, active FROM subscriptions ORDER BY next_due_date",
+        "subscriptions.json",
+    ),
+}
+
 def export_to_json(data_type: str) -> Path:
     """Export selected table contents to JSON under `cloud_bot/`.
 
@@ -1374,53 +1822,67 @@ def export_to_json(data_type: str) -> Path:
     Returns:
         Path to the exported JSON file.
     """
-
-    export_map = {
-        "accounts": (
-            "SELECT id, name, type, virtual_balance AS balance, active FROM accounts ORDER BY name",
-            "accounts.json",
-        ),
-        "categories": (
-            "SELECT id, name, type, COALESCE(emoji, '') AS emoji FROM categories ORDER BY type, name",
-            "categories.json",
-        ),
-        "bills": (
-            "SELECT id, name, amount, due_date, repeat_freq, account_id FROM bills ORDER BY due_date",
-            "bills.json",
-        ),
-        "subscriptions": (
-            "SELECT id, name, frequency, next_due_date, account_id, category_id, last_posted_date, active FROM subscriptions ORDER BY next_due_date",
-            "subscriptions.json",
-        ),
-    }
-
     key = data_type.lower()
-    if key not in export_map:
+    if key not in _EXPORT_MAP:
         raise ValueError("Unsupported export data_type")
 
-    query, filename = export_map[key]
+    query, filename = _EXPORT_MAP[key]
     conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
+        # Iterating the cursor honors arraysize, so rows come over in
+        # 1000-row fetches while memory stays O(batch), not O(table)
+        cursor.arraysize = 1000
         cursor.execute(query)
         columns = [col[0] for col in cursor.description]
-        rows = cursor.fetchall()
-        data = [dict(zip(columns, row)) for row in rows]
 
-        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        global _export_dir_ready
+        if not _export_dir_ready:
+            EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+            _export_dir_ready = True
         output_path = EXPORT_DIR / filename
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
 
-        logger.info(f"Exported {len(data)} {key} record(s) to {output_path}")
+        # Stream rows straight into the file: one dict + one json.dumps
+        # per row instead of materializing the whole table as a list of
+        # dicts and again as one big JSON string
+        count = 0
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for row in cursor:
+                record = dict(zip(columns, row))
+                if key == "accounts":
+                    record["emoji"] = _EMOJI_BY_TYPE.get(record["type"], _DEFAULT_EMOJI)
+                f.write(",\n  " if count else "\n  ")
+                f.write(json.dumps(record, ensure_ascii=False))
+                count += 1
+            f.write("\n]" if count else "]")
+
+        logger.info("Exported %s %s record(s) to %s", count, key, output_path)
         return output_path
     except sqlite3.Error as e:
-        logger.error(f"Error exporting {key}: {e}")
+        logger.error("Error exporting %s: %s", key, e)
         raise
     finally:
         if conn:
             close_connection(conn)
+
+def export_all(*data_types: str) -> List[Path]:
+    """Export several tables in one pass over a shared connection.
+
+    The per-thread connection cache means every export after the first
+    reuses the same warm connection and page cache, so exporting all
+    snapshots together costs one connect instead of one per table.
+
+    Args:
+        *data_types: Tables to export; defaults to every supported one.
+
+    Returns:
+        List of paths to the exported JSON files.
+    """
+    keys = data_types or tuple(_EXPORT_MAP)
+    return [export_to_json(key) for key in keys]
+
 if __name__ == "__main__":
     print("Database manager loaded successfully.")
     print("You can now use account management functions.")
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+reports.py - Read-only reporting queries over the expense database
+
+Feeds the dashboard/analysis side of the tracker. All heavy lifting
+happens in SQL or NumPy: the sign of each amount is computed by SQLite
+in the SELECT itself instead of a per-row pandas apply, which keeps the
+Python layer out of the inner loop entirely.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+import db_manager
+
+logger = logging.getLogger(__name__)
+
+# signed_amount arrives pre-computed from SQLite; expenses count
+# negative, everything else positive
+_SQL_TRANSACTIONS = (
+    "SELECT t.id, t.account_id, t.category_id, t.amount, t.type, t.date,"
+    " t.description, t.notes,"
+    " CASE WHEN t.type = 'expense' THEN -t.amount ELSE t.amount END AS signed_amount"
+    " FROM transactions t"
+)
+
+
+def fetch_transaction_data(start_date=None, end_date=None) -> pd.DataFrame:
+    """Load transactions into a DataFrame with a signed_amount column.
+
+    Args:
+        start_date: Inclusive ISO date lower bound (optional).
+        end_date: Inclusive ISO date upper bound (optional).
+
+    Returns:
+        DataFrame with the transaction columns plus signed_amount, and
+        date parsed to datetime64.
+    """
+    conditions = []
+    params = []
+    if start_date:
+        conditions.append("t.date >= ?")
+        params.append(start_date)
+    if end_date:
+        conditions.append("t.date <= ?")
+        params.append(end_date)
+
+    query = _SQL_TRANSACTIONS
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY t.date, t.id"
+
+    # Arrow-backed dtypes keep the string columns (type, description,
+    # notes) in contiguous buffers instead of one Python object per
+    # value, shrinking the frame and feeding filters/groupbys
+    # vectorized kernels
+    df = pd.read_sql_query(
+        query,
+        db_manager.get_connection(),
+        params=params,
+        dtype_backend="pyarrow",
+    )
+    # Explicit format skips pandas' per-value format inference
+    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d", cache=True)
+    return df
+
+
+def fetch_daily_net_flow(start_date, end_date) -> pd.DataFrame:
+    """Daily net flow over a date range, aggregated by SQLite.
+
+    Returns O(days) rows instead of pulling every transaction into
+    pandas: idx_tx_date drives the range scan and the GROUP BY happens
+    in the B-tree walk. A cumulative column is added with np.cumsum.
+
+    Args:
+        start_date: Inclusive ISO date lower bound.
+        end_date: Inclusive ISO date upper bound.
+
+    Returns:
+        DataFrame with date, net and cumulative columns ordered by date.
+    """
+    df = pd.read_sql_query(
+        "SELECT date,"
+        " SUM(CASE WHEN type = 'expense' THEN -amount ELSE amount END) AS net"
+        " FROM transactions WHERE date BETWEEN ? AND ?"
+        " GROUP BY date ORDER BY date",
+        db_manager.get_connection(),
+        params=[start_date, end_date],
+    )
+    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d", cache=True)
+    df["cumulative"] = np.cumsum(df["net"].values)
+    return df
+
+
+def downsample_net_flow(df: pd.DataFrame, max_points: int = 500) -> pd.DataFrame:
+    """Bucket a daily net-flow frame to weekly when it gets too dense.
+
+    Charts bog down past a few thousand SVG points; multi-year ranges
+    are resampled to week-ends so the renderer draws O(weeks) markers
+    while the cumulative line keeps its shape (last value per bucket).
+
+    Args:
+        df: Frame from fetch_daily_net_flow.
+        max_points: Row count above which to resample. Defaults to 500.
+
+    Returns:
+        The frame unchanged if small enough, else a weekly aggregate
+        with net summed and cumulative carried forward per bucket.
+    """
+    if len(df) <= max_points:
+        return df
+    weekly = (
+        df.set_index("date")
+        .resample("W")
+        .agg({"net": "sum", "cumulative": "last"})
+        .dropna(subset=["cumulative"])
+        .reset_index()
+    )
+    return weekly
+
+
+def fetch_category_totals(start_date, end_date, txn_type="expense") -> pd.DataFrame:
+    """Per-category totals for one transaction type over a date range.
+
+    Args:
+        start_date: Inclusive ISO date lower bound.
+        end_date: Inclusive ISO date upper bound.
+        txn_type: 'expense' or 'income'. Defaults to 'expense'.
+
+    Returns:
+        DataFrame with category and total columns, largest total first.
+    """
+    return pd.read_sql_query(
+        "SELECT COALESCE(c.name, 'Uncategorized') AS category,"
+        " SUM(t.amount) AS total"
+        " FROM transactions t LEFT JOIN categories c ON c.id = t.category_id"
+        " WHERE t.date BETWEEN ? AND ? AND t.type = ?"
+        " GROUP BY t.category_id ORDER BY total DESC",
+        db_manager.get_connection(),
+        params=[start_date, end_date, txn_type],
+    )
+
+
+def fetch_kpis(start_date, end_date) -> dict:
+    """Total income, total expense and net flow as three scalars.
+
+    One aggregate query replaces loading the full range into pandas
+    just to sum it.
+
+    Args:
+        start_date: Inclusive ISO date lower bound.
+        end_date: Inclusive ISO date upper bound.
+
+    Returns:
+        Dict with total_income, total_expense and net_flow keys.
+    """
+    row = db_manager.get_connection().execute(
+        "SELECT"
+        " COALESCE(SUM(CASE WHEN type = 'income' THEN amount END), 0) AS total_income,"
+        " COALESCE(SUM(CASE WHEN type = 'expense' THEN amount END), 0) AS total_expense,"
+        " COALESCE(SUM(CASE WHEN type = 'expense' THEN -amount ELSE amount END), 0) AS net_flow"
+        " FROM transactions WHERE date BETWEEN ? AND ?",
+        (start_date, end_date),
+    ).fetchone()
+    return dict(row)
+
+
+def signed_amounts(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized fallback for frames loaded without signed_amount."""
+    if "signed_amount" in df.columns:
+        return df["signed_amount"].values
+    return np.where(
+        df["type"].values == "expense",
+        -df["amount"].values,
+        df["amount"].values,
+    )
@@ -0,0 +1,143 @@
+"""
+statement_processor.py - Turn bank-statement CSVs into reviewable rows
+
+Statements arrive as CSVs with Date, Amount and Description columns
+(the Transfers/image2csv.py OCR flow produces the same shape). The
+parser works on whole columns at once — no per-row Python loop — and
+hands back plain dicts for the review step before anything is written
+to the database.
+"""
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import db_manager
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ["Date", "Amount", "Description"]
+
+# Rows start unassigned; the review step maps them to real accounts
+# and categories before import
+NEEDS_REVIEW = "Need Review"
+
+
+def parse_csv_data(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Build the review list from a raw statement DataFrame.
+
+    All derivations run as vectorized column operations and the result
+    comes out of a single to_dict('records') call, instead of an
+    iterrows loop building one dict (and parsing one date) per row.
+
+    Args:
+        df: DataFrame with Date, Amount and Description columns.
+
+    Returns:
+        List of row dicts with date, amount, type, account_name,
+        category and description keys. Rows whose date fails to parse
+        are dropped with a warning.
+
+    Raises:
+        ValueError: If a required column is missing.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Statement CSV missing columns: {', '.join(missing)}")
+
+    out = pd.DataFrame()
+    out["date"] = pd.to_datetime(df["Date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    out["amount"] = pd.to_numeric(df["Amount"], errors="coerce").abs()
+    out["type"] = np.where(
+        pd.to_numeric(df["Amount"], errors="coerce").values < 0, "expense", "income"
+    )
+    out["account_name"] = NEEDS_REVIEW
+    out["category"] = NEEDS_REVIEW
+    out["description"] = df["Description"].astype(str).str.strip()
+
+    bad = out["date"].isna() | out["amount"].isna()
+    if bad.any():
+        logger.warning("Dropping %s unparseable statement row(s)", int(bad.sum()))
+        out = out[~bad]
+
+    return out[["date", "amount", "type", "account_name", "category", "description"]].to_dict("records")
+
+
+@lru_cache(maxsize=1)
+def load_db_config() -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Load the account and category name->id mappings once.
+
+    These are small, rarely-changing lookup tables; a plain in-process
+    lru_cache returns them by reference with no serialization layer in
+    between. Call load_db_config.cache_clear() after adding accounts
+    or categories.
+
+    Returns:
+        Tuple of (account name->id, category name->id) dicts.
+    """
+    conn = db_manager.get_connection()
+    return (
+        dict(conn.execute("SELECT name, id FROM accounts")),
+        dict(conn.execute("SELECT name, id FROM categories")),
+    )
+
+
+def insert_approved_transactions_bulk(rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert every approved review row in one batched transaction.
+
+    Approving rows one at a time costs a name-lookup SELECT, an INSERT
+    and a commit per row. This path loads the account and category
+    name->id mappings once, skips rows still marked for review, and
+    hands the rest to add_transactions, which runs a single executemany
+    under one transaction.
+
+    Args:
+        rows: Review dicts from parse_csv_data with account_name and
+            category filled in.
+
+    Returns:
+        List of new transaction IDs for the inserted rows.
+
+    Raises:
+        ValueError: If an approved row names an unknown account.
+    """
+    approved = [
+        r for r in rows
+        if r["account_name"] != NEEDS_REVIEW and r["category"] != NEEDS_REVIEW
+    ]
+    if not approved:
+        return []
+
+    account_ids, category_ids = load_db_config()
+
+    batch = []
+    for row in approved:
+        account_id = account_ids.get(row["account_name"])
+        if account_id is None:
+            raise ValueError(f"Unknown account: {row['account_name']!r}")
+        batch.append({
+            "account_id": account_id,
+            "category_id": category_ids.get(row["category"]),
+            "amount": row["amount"],
+            "type": row["type"],
+            "date": row["date"],
+            "description": row.get("description", ""),
+        })
+
+    txn_ids = db_manager.add_transactions(batch)
+    logger.info("Inserted %s approved transaction(s)", len(txn_ids))
+    return txn_ids
+
+
+def parse_csv_file(path) -> List[Dict[str, Any]]:
+    """Read a statement CSV from disk and parse it into review rows.
+
+    Args:
+        path: Path to the CSV file.
+
+    Returns:
+        Same shape as parse_csv_data.
+    """
+    return parse_csv_data(pd.read_csv(path))
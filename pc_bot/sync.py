@@ -0,0 +1,153 @@
+"""
+sync.py - Pull buffered cloud-bot expenses into the local database
+
+The Discord bot appends expenses to cloud_bot/expense_buffer.jsonl;
+this script drains that buffer into SQLite in one batch. All rows go
+through db_manager.add_transactions, so the whole sync is a single
+executemany under one transaction instead of a statement and commit
+per row.
+"""
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import db_manager
+
+logger = logging.getLogger(__name__)
+
+BUFFER_FILE = Path(__file__).resolve().parent.parent / "cloud_bot" / "expense_buffer.jsonl"
+
+# Retry schedule (seconds) when another writer holds the database past
+# the connection's busy_timeout; sync is a background batch job, so
+# waiting beats failing
+_RETRY_DELAYS = (0.5, 1.0, 2.0)
+
+
+def _read_buffer(path: Path) -> Tuple[List[Dict[str, Any]], int]:
+    """Read buffered entries plus the byte offset they end at.
+
+    Corrupted lines are skipped, matching the cloud bot's own reader.
+    The offset lets sync_buffer drop exactly the bytes it consumed:
+    the bot may append more entries while the batch is being written,
+    and those must survive the cleanup.
+
+    Args:
+        path: Buffer file to read.
+
+    Returns:
+        Tuple of (entry dicts, end offset of the last complete line);
+        ([], 0) if the file is missing.
+    """
+    if not path.exists():
+        return [], 0
+    entries = []
+    consumed = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Partial last line still being appended; leave it
+            consumed += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries, consumed
+
+
+def _drop_consumed(path: Path, consumed: int) -> None:
+    """Remove the first ``consumed`` bytes, keeping newer appends."""
+    with open(path, "r+b") as f:
+        f.seek(consumed)
+        remainder = f.read()
+        f.seek(0)
+        f.write(remainder)
+        f.truncate(len(remainder))
+
+
+def load_buffer(path: Path = BUFFER_FILE) -> List[Dict[str, Any]]:
+    """Read buffered entries from the JSONL file.
+
+    Args:
+        path: Buffer file to read. Defaults to the cloud_bot buffer.
+
+    Returns:
+        List of buffered entry dicts; empty if the file is missing.
+    """
+    return _read_buffer(path)[0]
+
+
+def _resolve_account_ids(entries: List[Dict[str, Any]]) -> None:
+    """Fill in account_id for entries keyed by account name.
+
+    Older buffer entries carry an "account" name instead of an id. One
+    SELECT loads the whole name->id mapping instead of a lookup query
+    per row; unknown names fail the batch up front, before anything is
+    written.
+
+    Raises:
+        ValueError: If an entry names an account that does not exist.
+    """
+    if all("account_id" in e for e in entries):
+        return
+    name_to_id = dict(
+        db_manager.get_connection().execute("SELECT name, id FROM accounts")
+    )
+    for entry in entries:
+        if "account_id" in entry:
+            continue
+        name = entry.get("account")
+        if name not in name_to_id:
+            raise ValueError(f"Unknown account in buffer entry: {name!r}")
+        entry["account_id"] = name_to_id[name]
+
+
+def sync_buffer(path: Path = BUFFER_FILE, clear: bool = True) -> List[int]:
+    """Insert every buffered expense into the database in one batch.
+
+    Args:
+        path: Buffer file to drain. Defaults to the cloud_bot buffer.
+        clear: Truncate the buffer after a successful sync.
+
+    Returns:
+        List of new transaction IDs in buffer order; empty if the
+        buffer had nothing to sync.
+    """
+    entries, consumed = _read_buffer(path)
+    if not entries:
+        logger.info("Buffer empty, nothing to sync")
+        return []
+
+    _resolve_account_ids(entries)
+
+    # add_transactions takes the write lock up front (BEGIN IMMEDIATE)
+    # and the connection waits busy_timeout for it; if a long writer
+    # still wins, back off and retry instead of dropping the batch
+    for attempt, delay in enumerate(_RETRY_DELAYS + (None,)):
+        try:
+            txn_ids = db_manager.add_transactions(entries)
+            break
+        except sqlite3.OperationalError as e:
+            if delay is None or "locked" not in str(e) and "busy" not in str(e):
+                raise
+            logger.warning(
+                "Database busy, retrying sync in %.1fs (attempt %s)", delay, attempt + 1
+            )
+            time.sleep(delay)
+
+    if clear:
+        # Drop only the bytes this batch consumed; entries appended
+        # while the insert ran stay queued for the next sync
+        _drop_consumed(path, consumed)
+    logger.info("Synced %s buffered expense(s)", len(txn_ids))
+    return txn_ids
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sync_buffer()